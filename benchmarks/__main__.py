@@ -0,0 +1,66 @@
+import argparse
+import os
+import platform
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from benchmarks import (  # noqa: E402
+    bench_achievements, bench_connections, bench_parsers, bench_processes, bench_registry
+)
+from benchmarks.runner import compare, load, save  # noqa: E402
+
+_SUITES = {
+    "achievements": bench_achievements
+    , "connections": bench_connections
+    , "parsers": bench_parsers
+    , "processes": bench_processes
+    , "registry": bench_registry
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--output", default="bench.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("suites", nargs="*", default=sorted(_SUITES))
+    args = parser.parse_args()
+
+    results = {}
+    for suite in args.suites:
+        note = getattr(_SUITES[suite], "NOTE", None)
+        if note:
+            print(f"NOTE {suite}: {note}")
+        results.update(_SUITES[suite].run(args.repeat))
+
+    for name, result in sorted(results.items()):
+        print(f"{name:50} " + " ".join(f"{metric}={value:.6g}" for metric, value in sorted(result.items())))
+
+    save(results, args.output)
+    if not args.baseline:
+        return 0
+
+    if args.save_baseline:
+        save(results, args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, create one with --save-baseline")
+        return 1
+
+    python_version, baseline = load(args.baseline)
+    if python_version and python_version.rsplit(".", 1)[0] != platform.python_version().rsplit(".", 1)[0]:
+        print(f"NOTE the baseline was recorded with python {python_version}, peak_bytes may differ between versions")
+
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
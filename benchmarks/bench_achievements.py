@@ -0,0 +1,76 @@
+import asyncio
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from aiohttp import hdrs
+
+from benchmarks.runner import Results, measure
+from poe_http_client import PoeHttpClient
+from poe_plugin import PoePlugin
+from poe_types import PoeSessionId, ProfileName
+from poe_unlock_store import UnlockTimeStore
+from tests.pages import generate_page
+
+SIZES = (100, 1000, 10000)
+
+
+class _PageResponse:
+    status = 200
+
+    def __init__(self, page: bytes):
+        self._page = page
+        self.headers = {hdrs.CONTENT_LENGTH: str(len(page))}
+
+    async def read(self) -> bytes:
+        return self._page
+
+    def release(self):
+        pass
+
+
+def run(repeat: int) -> Results:
+    results = {}
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    data_dir = tempfile.TemporaryDirectory()
+
+    async def create_client() -> PoeHttpClient:
+        return PoeHttpClient(PoeSessionId("poesessid"), ProfileName("profile_name"), lambda: None)
+
+    http_client = loop.run_until_complete(create_client())
+    with patch.object(PoePlugin, "_read_manifest", return_value={
+        "platform": "pathofexile", "guid": "52d06761-1c23-d725-9720-57ee0b8b14bc", "version": "0.0"
+    }), patch.object(PoePlugin, "_get_data_dir", return_value=data_dir.name):
+        plugin = PoePlugin(MagicMock(), MagicMock(), "token")
+
+    try:
+        for size in SIZES:
+            page, completed_names = generate_page(size)
+
+            async def get_page(*args, **kwargs):
+                return _PageResponse(page)
+
+            http_client._authenticated_request = get_page
+            results[f"get_achievements[{size}]"] = measure(
+                lambda: loop.run_until_complete(http_client.get_achievements())
+                , repeat
+                , setup=http_client._achievements_snapshots.clear
+            )
+
+            def reset_store(path=f"{data_dir.name}/{size}.log"):
+                plugin._achievements_store = UnlockTimeStore(path)
+
+            achievements = loop.run_until_complete(http_client.get_achievements())
+            assert [achievement.name for achievement in achievements] == completed_names
+
+            results[f"get_unlocked_achievements[{size}]"] = measure(
+                lambda: loop.run_until_complete(plugin.get_unlocked_achievements(plugin._GAME_ID, achievements))
+                , repeat
+                , setup=reset_store
+            )
+    finally:
+        loop.run_until_complete(http_client.shutdown())
+        loop.close()
+        data_dir.cleanup()
+
+    return results
@@ -0,0 +1,62 @@
+import asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from benchmarks.runner import Results, measure
+from poe_http_client import ConnectorOptions, PoeHttpClient
+from poe_types import PoeSessionId, ProfileName
+from tests.pages import generate_page
+
+NOTE = (
+    "runs against a loopback server over plain http: no DNS lookup and no TLS handshake are involved, so only the"
+    " connection reuse shows here, not the DNS cache or the saved handshakes"
+)
+
+
+def run(repeat: int) -> Results:
+    results = {}
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    page, _ = generate_page(100)
+
+    async def achievements(request):
+        return web.Response(body=page, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/account/view-profile/{profile_name}/achievements", achievements)
+    server = TestServer(app)
+    loop.run_until_complete(server.start_server())
+
+    http_clients = []
+
+    async def create_client(prefetched: bool, connector_options: ConnectorOptions):
+        http_client = PoeHttpClient(
+            PoeSessionId("poesessid")
+            , ProfileName("profile_name")
+            , lambda: None
+            , connector_options=connector_options
+            , base_url=str(server.make_url("")).rstrip("/")
+        )
+        if prefetched:
+            # what the plugin does right after the authentication, the measured request finds the connection open
+            await http_client.get_achievements()
+        http_clients.append(http_client)
+
+    try:
+        for name, prefetched, connector_options in (
+            ("cold", False, ConnectorOptions(ttl_dns_cache=None, keepalive_timeout=15))
+            , ("tuned", False, ConnectorOptions())
+            , ("prefetched", True, ConnectorOptions())
+        ):
+            results[f"first_request[loopback,{name}]"] = measure(
+                lambda: loop.run_until_complete(http_clients[-1].get_achievements())
+                , repeat
+                , setup=lambda: loop.run_until_complete(create_client(prefetched, connector_options))
+            )
+    finally:
+        for http_client in http_clients:
+            loop.run_until_complete(http_client.shutdown())
+        loop.run_until_complete(server.close())
+        loop.close()
+
+    return results
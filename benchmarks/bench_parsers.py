@@ -0,0 +1,16 @@
+from benchmarks.runner import Results, measure
+from poe_parsers import ACHIEVEMENTS_PARSERS
+from tests.pages import generate_page
+
+SIZES = (100, 1000, 10000)
+
+
+def run(repeat: int) -> Results:
+    results = {}
+    for size in SIZES:
+        page, completed_names = generate_page(size)
+        for parser_name, parser in sorted(ACHIEVEMENTS_PARSERS.items()):
+            assert [achievement.name for achievement in parser(page)] == completed_names
+            results[f"parse_achievements[{parser_name}-{size}]"] = measure(lambda: parser(page), repeat)
+
+    return results
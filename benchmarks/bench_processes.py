@@ -0,0 +1,55 @@
+import os
+
+from benchmarks.runner import Results, measure
+from poe_processes import FakeProcessSource, ProcessScanner
+
+SIZES = (500, 5000)
+_PROC_NAMES = ["pathofexile.exe", "pathofexile_x64.exe"]
+_GAME_PID = 1_000_000
+
+
+def _create_source(processes: int) -> FakeProcessSource:
+    return FakeProcessSource({
+        pid: os.path.join(os.path.sep, "Program Files", f"Vendor {pid % 50}", f"application_{pid}.exe")
+        for pid in range(4, processes * 4, 4)
+    })
+
+
+def _full_scan(source: FakeProcessSource) -> bool:
+    # the scan the plugin did on every tick before the scanner kept its state
+    for pid in source.pids():
+        binary_path = source.get_binary_path(pid)
+        if binary_path is None:
+            continue
+
+        for proc_name in _PROC_NAMES:
+            if binary_path.lower().endswith(os.path.join(os.path.sep, proc_name)):
+                return True
+
+    return False
+
+
+def run(repeat: int) -> Results:
+    results = {}
+    for size in SIZES:
+        for state in ("idle", "running"):
+            source = _create_source(size)
+            if state == "running":
+                source.processes[_GAME_PID] = os.path.join(os.path.sep, "Games", "Path of Exile", "PathOfExile_x64.exe")
+            scanner = ProcessScanner(source, _PROC_NAMES)
+            scanner.is_running()
+
+            def reset_lookups():
+                source.lookups = 0
+                source.create_time_lookups = 0
+
+            results[f"process_scan[full,{state},{size}]"] = measure(lambda: _full_scan(source), repeat, reset_lookups)
+            results[f"process_scan[full,{state},{size}]"]["process_lookups"] = (
+                source.lookups + source.create_time_lookups
+            )
+            results[f"process_scan[incremental,{state},{size}]"] = measure(scanner.is_running, repeat, reset_lookups)
+            results[f"process_scan[incremental,{state},{size}]"]["process_lookups"] = (
+                source.lookups + source.create_time_lookups
+            )
+
+    return results
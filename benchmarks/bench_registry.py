@@ -0,0 +1,42 @@
+from benchmarks.runner import Results, measure
+from poe_registry import FakeRegistryBackend, HKEY_LOCAL_MACHINE, UNINSTALL_KEY, UninstallEntryIndex
+
+SIZES = (100, 1000, 5000)
+_DISPLAY_NAME = "Path of Exile"
+
+
+def _create_registry(entries: int) -> FakeRegistryBackend:
+    registry = FakeRegistryBackend()
+    for index in range(entries):
+        path = UNINSTALL_KEY + f"\\{{{index:08X}-0000-0000-0000-000000000000}}"
+        registry.set_value(HKEY_LOCAL_MACHINE, path, "DisplayName", f"Application {index}")
+        registry.set_value(HKEY_LOCAL_MACHINE, path, "Installed", 1)
+
+    path = UNINSTALL_KEY + "\\{ffffffff-0000-0000-0000-000000000000}"
+    registry.set_value(HKEY_LOCAL_MACHINE, path, "DisplayName", _DISPLAY_NAME)
+    registry.set_value(HKEY_LOCAL_MACHINE, path, "Installed", 1)
+    registry.set_value(HKEY_LOCAL_MACHINE, path, "BundleCachePath", "PathOfExileInstaller.exe")
+    return registry
+
+
+def run(repeat: int) -> Results:
+    results = {}
+    for size in SIZES:
+        registry = _create_registry(size)
+        indexes = []
+
+        def create_index():
+            indexes.append(UninstallEntryIndex(registry, _DISPLAY_NAME, value_names=["BundleCachePath"]))
+            registry.queries = 0
+
+        def warm_index():
+            create_index()
+            indexes[-1].find()
+            registry.queries = 0
+
+        results[f"uninstall_lookup[cold,{size}]"] = measure(lambda: indexes[-1].find(), repeat, setup=create_index)
+        results[f"uninstall_lookup[cold,{size}]"]["registry_queries"] = registry.queries
+        results[f"uninstall_lookup[cached,{size}]"] = measure(lambda: indexes[-1].find(), repeat, setup=warm_index)
+        results[f"uninstall_lookup[cached,{size}]"]["registry_queries"] = registry.queries
+
+    return results
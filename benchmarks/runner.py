@@ -0,0 +1,62 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+Result = Dict[str, float]
+Results = Dict[str, Result]
+
+# only the metrics that do not depend on the machine or its load gate a build, wall times are reported alone
+_GATED = ("peak_bytes", "registry_queries", "process_lookups")
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, setup: Callable[[], object] = lambda: None) -> Result:
+    wall_times = []
+    for _ in range(repeat):
+        setup()
+        started = time.perf_counter()
+        fn()
+        wall_times.append(time.perf_counter() - started)
+
+    setup()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "wall_s": statistics.median(wall_times)
+        , "peak_bytes": peak
+    }
+
+
+def save(results: Results, path: str):
+    with open(path, "w") as output:
+        json.dump({"python": platform.python_version(), "results": results}, output, indent=4, sort_keys=True)
+
+
+def load(path: str) -> Tuple[Optional[str], Results]:
+    with open(path, "r") as baseline:
+        content = json.load(baseline)
+    return content.get("python"), content["results"]
+
+
+def compare(results: Results, baseline: Results, tolerance: float) -> List[str]:
+    regressions = []
+    for name, result in sorted(results.items()):
+        for metric in _GATED:
+            expected = baseline.get(name, {}).get(metric)
+            if expected is None or metric not in result:
+                continue
+
+            if result[metric] > expected * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {metric} {result[metric]:.6g} exceeds baseline {expected:.6g}"
+                    f" by more than {tolerance:.0%}"
+                )
+
+    return regressions
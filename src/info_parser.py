@@ -1,9 +1,13 @@
+import argparse
 import json
+import os
 from dataclasses import asdict, dataclass, is_dataclass
 
 import requests
 from bs4 import BeautifulSoup
 
+from poe_catalog import load_ids, merge_names, save_ids
+
 
 @dataclass
 class Achievement:
@@ -26,12 +30,19 @@ def parse_achievement(row):
         release_per_platform_id="pathofexile_PathOfExile",
         name=name,
         description=get_text(columns[1]),
-        api_key=str(len(achievements)),
+        api_key="",
         image_url_unlocked=str(columns[0].find_all("a", {"class": "image"})[0].img["src"]),
         image_url_locked=""
     )
 
 
+arg_parser = argparse.ArgumentParser()
+arg_parser.add_argument("output", nargs="?", default="achievements.json")
+arg_parser.add_argument("--ids", default="achievement_ids.json")
+arg_parser.add_argument("--locked", default=r"d:\locked_ach.html")
+args = arg_parser.parse_args()
+output_path, locked_achievements_path = args.output, args.locked
+
 achievements = {}
 
 for row in BeautifulSoup(
@@ -41,14 +52,22 @@ for row in BeautifulSoup(
     name, achievement = parse_achievement(row)
     achievements[name] = achievement
 
-locked_ach_map = dict()
-with open(r"d:\locked_ach.html", "r") as f:
-    for row in BeautifulSoup(f.read(), "lxml").select("div.achieveRow"):
-        ach = achievements.get(get_text(row.select_one("div.achieveTxt").h3))
-        if ach is None:
-            continue
+if os.path.exists(locked_achievements_path):
+    with open(locked_achievements_path, "r") as f:
+        for row in BeautifulSoup(f.read(), "lxml").select("div.achieveRow"):
+            ach = achievements.get(get_text(row.select_one("div.achieveTxt").h3))
+            if ach is None:
+                continue
+
+            ach.image_url_locked = row.select_one("div.CachieveImgHolder").img["src"]
+
 
-        ach.image_url_locked = row.select_one("div.CachieveImgHolder").img["src"]
+# the published api keys are the catalog ids: positions in the ids file, which new achievements are appended to
+names = merge_names(load_ids(args.ids), achievements)
+save_ids(args.ids, names)
+for achievement_id, name in enumerate(names):
+    if name in achievements:
+        achievements[name].api_key = str(achievement_id)
 
 
 class AchievementEncoder(json.JSONEncoder):
@@ -58,5 +77,5 @@ class AchievementEncoder(json.JSONEncoder):
         return super().default(o)
 
 
-with open(r"d:\achievements.json", "w+") as f:
+with open(output_path, "w+") as f:
     json.dump(list(achievements.values()), f, cls=AchievementEncoder, indent=4)
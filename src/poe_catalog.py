@@ -0,0 +1,162 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from poe_types import AchievementId, AchievementName
+
+_MAGIC = b"POEC"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHII")
+_ENTRY = struct.Struct("<I")
+
+
+def _table_size(count: int) -> int:
+    size = 1
+    while size < 2 * count:
+        size *= 2
+    return size
+
+
+def merge_names(previous: Sequence[str], current: Iterable[str]) -> List[str]:
+    known = set(previous)
+    merged = list(previous)
+    for name in current:
+        if name not in known:
+            known.add(name)
+            merged.append(name)
+
+    return merged
+
+
+def pack_catalog(names: Sequence[str]) -> bytes:
+    encoded_names = [name.encode("utf-8") for name in names]
+
+    offsets = [0]
+    for encoded_name in encoded_names:
+        offsets.append(offsets[-1] + len(encoded_name))
+
+    table_size = _table_size(len(encoded_names))
+    table = [0] * table_size
+    for achievement_id, encoded_name in enumerate(encoded_names):
+        slot = zlib.crc32(encoded_name) & (table_size - 1)
+        while table[slot]:
+            slot = (slot + 1) & (table_size - 1)
+        table[slot] = achievement_id + 1
+
+    return b"".join([
+        _HEADER.pack(_MAGIC, _VERSION, 0, len(encoded_names), table_size)
+        , struct.pack(f"<{len(offsets)}I", *offsets)
+        , struct.pack(f"<{table_size}I", *table)
+    ] + encoded_names)
+
+
+class AchievementCatalog:
+    def __init__(self, path: str):
+        self._path = path
+        self._data = None
+        self._count = 0
+        self._table_size = 0
+        self._offsets_start = 0
+        self._table_start = 0
+        self._names_start = 0
+        self._names: Dict[AchievementId, AchievementName] = {}
+
+    def _load(self):
+        if self._data is not None:
+            return
+
+        try:
+            with open(self._path, "rb") as catalog:
+                self._data = mmap.mmap(catalog.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._data = b""
+            return
+
+        if len(self._data) < _HEADER.size:
+            self.close()
+            self._data = b""
+            return
+
+        magic, version, _, count, table_size = _HEADER.unpack_from(self._data)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            self._data = b""
+            return
+
+        self._count, self._table_size = count, table_size
+
+        self._offsets_start = _HEADER.size
+        self._table_start = self._offsets_start + (self._count + 1) * _ENTRY.size
+        self._names_start = self._table_start + self._table_size * _ENTRY.size
+
+    def __len__(self) -> int:
+        self._load()
+        return self._count
+
+    def _get_encoded_name(self, achievement_id: int) -> bytes:
+        start, end = struct.unpack_from("<2I", self._data, self._offsets_start + achievement_id * _ENTRY.size)
+        return self._data[self._names_start + start:self._names_start + end]
+
+    def name_of(self, achievement_id: AchievementId) -> Optional[AchievementName]:
+        self._load()
+        if not 0 <= achievement_id < self._count:
+            return None
+
+        name = self._names.get(achievement_id)
+        if name is None:
+            name = self._names[achievement_id] = AchievementName(
+                sys.intern(self._get_encoded_name(achievement_id).decode("utf-8"))
+            )
+        return name
+
+    def id_of(self, achievement_name: AchievementName) -> Optional[AchievementId]:
+        self._load()
+        if not self._table_size:
+            return None
+
+        encoded_name = achievement_name.encode("utf-8")
+        slot = zlib.crc32(encoded_name) & (self._table_size - 1)
+        while True:
+            entry = _ENTRY.unpack_from(self._data, self._table_start + slot * _ENTRY.size)[0]
+            if not entry:
+                return None
+            if self._get_encoded_name(entry - 1) == encoded_name:
+                return AchievementId(entry - 1)
+            slot = (slot + 1) & (self._table_size - 1)
+
+    def names(self) -> List[AchievementName]:
+        return [self.name_of(AchievementId(achievement_id)) for achievement_id in range(len(self))]
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = None
+        self._names.clear()
+
+
+def load_ids(path: str) -> List[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as ids_file:
+            return json.load(ids_file)
+    except FileNotFoundError:
+        return []
+
+
+def save_ids(path: str, names: Sequence[str]):
+    with open(path + ".tmp", "w", encoding="utf-8") as ids_file:
+        json.dump(list(names), ids_file, ensure_ascii=False, indent=4)
+    os.replace(path + ".tmp", path)
+
+
+def main(ids: str, target: str):
+    with open(target + ".tmp", "wb") as catalog:
+        catalog.write(pack_catalog(load_ids(ids)))
+    os.replace(target + ".tmp", target)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
@@ -0,0 +1,113 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+)$")
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def parse_content_range(value: Optional[str]) -> Optional[Tuple[int, int, int]]:
+    match = _CONTENT_RANGE.match((value or "").strip())
+    if not match:
+        return None
+
+    first, last, size = (int(group) for group in match.groups())
+    return (first, last, size) if first <= last < size else None
+
+
+class Throttle:
+    def __init__(self, bandwidth: int):
+        self._bandwidth = bandwidth
+        self._available_at = 0.0
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    async def _wait(self, delay: float):
+        await asyncio.sleep(delay)
+
+    async def consume(self, size: int):
+        # every chunk books its share of the bandwidth, the ones sharing the throttle queue up behind it
+        now = self._now()
+        self._available_at = max(self._available_at, now) + size / self._bandwidth
+        delay = self._available_at - now
+        if delay > 0:
+            await self._wait(delay)
+
+
+@dataclass
+class DownloadState:
+    size: int
+    segment_size: int
+    etag: Optional[str]
+    last_modified: Optional[str]
+    completed: Set[int] = field(default_factory=set)
+
+    @property
+    def segments(self) -> int:
+        return -(-self.size // self.segment_size)
+
+    def get_range(self, index: int) -> Tuple[int, int]:
+        first = index * self.segment_size
+        return first, min(first + self.segment_size, self.size) - 1
+
+    def get_pending(self) -> List[int]:
+        return [index for index in range(self.segments) if index not in self.completed]
+
+    def get_completed_size(self) -> int:
+        return sum(last - first + 1 for first, last in map(self.get_range, self.completed))
+
+    def matches(self, size: int, etag: Optional[str], last_modified: Optional[str]) -> bool:
+        return (self.size, self.etag, self.last_modified) == (size, etag, last_modified)
+
+
+def load_state(path: str) -> Optional[DownloadState]:
+    try:
+        with open(path) as state_file:
+            record = json.load(state_file)
+        state = DownloadState(
+            size=int(record["size"])
+            , segment_size=int(record["segment_size"])
+            , etag=record.get("etag")
+            , last_modified=record.get("last_modified")
+            , completed={int(index) for index in record["completed"]}
+        )
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError):
+        logger.warning("Ignoring the malformed download state %s", path)
+        return None
+
+    if state.size <= 0 or state.segment_size <= 0:
+        return None
+    state.completed &= set(range(state.segments))
+    return state
+
+
+def save_state(path: str, state: DownloadState):
+    with open(path + ".tmp", "w") as state_file:
+        json.dump({
+            "size": state.size
+            , "segment_size": state.segment_size
+            , "etag": state.etag
+            , "last_modified": state.last_modified
+            , "completed": sorted(state.completed)
+        }, state_file)
+    os.replace(path + ".tmp", path)
@@ -1,57 +1,724 @@
+import asyncio
+import hashlib
+import ipaddress
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import Enum
 from http import HTTPStatus
 from http.cookies import SimpleCookie
-from typing import Callable
+from typing import AsyncIterator, Callable, Dict, Mapping, Optional, Union
+from urllib.parse import urlsplit
 
 import aiohttp
+from aiohttp import hdrs
 from aiohttp.client import ClientResponse
-from bs4 import BeautifulSoup
-from galaxy.api.errors import AuthenticationRequired, UnknownBackendResponse
-from galaxy.http import HttpClient
+from galaxy.api.errors import AuthenticationRequired, TooManyRequests, UnknownBackendResponse, UnknownError
+from galaxy.http import create_client_session, create_tcp_connector, handle_exception
+from lxml import etree
 
-from poe_types import AchievementTagSet, HtmlPage, PoeSessionId, ProfileName
+from poe_download import DownloadState, hash_file, load_state, parse_content_range, save_state, Throttle
+from poe_metrics import HttpMetrics
+from poe_rate_limit import RateLimiter
+from poe_retry import CircuitBreaker, CircuitOpen, IDEMPOTENT_METHODS, RETRIABLE_ERRORS, RetryPolicy
+from poe_parsers import ACHIEVEMENTS_PARSERS, AchievementsStreamParser
+from poe_types import (
+    AchievementRecord, AchievementSet, AchievementsParser, DownloadedFile, HtmlPage, PoeSessionId, ProfileName,
+    ProgressCallback
+)
 
+logger = logging.getLogger(__name__)
 
-class PoeHttpClient(HttpClient):
-    _INSTALL_BIN_URL = "https://www.pathofexile.com/downloads/PathOfExileInstaller.exe"
+_DIV_TAG = re.compile(rb"<(/?)div\b", re.IGNORECASE)
 
-    def __init__(self, poesessid: PoeSessionId, profile_name: ProfileName, auth_lost_callback: Callable):
+
+@dataclass
+class _PageSnapshot:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    digest: bytes
+    content: AchievementSet
+    refreshed_at: float
+
+
+@dataclass(frozen=True)
+class ConnectorOptions:
+    limit: int = 30
+    limit_per_host: int = 10
+    keepalive_timeout: float = 60
+    ttl_dns_cache: Optional[int] = 10 * 60
+    family: int = 0
+
+
+class RequestClass(Enum):
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+
+
+@dataclass(frozen=True)
+class LaneOptions:
+    concurrency: int
+    timeout: aiohttp.ClientTimeout
+
+
+DEFAULT_LANES = {
+    RequestClass.INTERACTIVE: LaneOptions(8, aiohttp.ClientTimeout(total=30, sock_connect=10))
+    , RequestClass.BULK: LaneOptions(4, aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=60))
+}
+
+
+class _Lane:
+    def __init__(self, options: LaneOptions):
+        self.options = options
+        self.semaphore = asyncio.Semaphore(options.concurrency)
+
+
+class PoeHttpClient:
+    BASE_URL = "https://www.pathofexile.com"
+    _ACHIEVEMENTS_PATH = "/account/view-profile/{profile_name}/achievements"
+    _INSTALL_BIN_PATH = "/downloads/PathOfExileInstaller.exe"
+    _ACHIEVEMENTS_SECTION = b'class="achievement-list"'
+    _PAGE_CHUNK_SIZE = 16 * 1024
+    _FILE_CHUNK_SIZE = 256 * 1024
+    _DOWNLOAD_SEGMENT_SIZE = 4 * 1024 * 1024
+    ACHIEVEMENTS_ENDPOINT = "achievements"
+    INSTALLER_ENDPOINT = "installer"
+
+    def __init__(
+        self
+        , poesessid: PoeSessionId
+        , profile_name: ProfileName
+        , auth_lost_callback: Callable
+        , parser: str = "lxml"
+        , parse_processes: int = 0
+        , parse_time_budget: float = 0.5
+        , metrics_path: Optional[str] = None
+        , metrics_interval: float = 60
+        , retry_policy: RetryPolicy = RetryPolicy()
+        , circuit_breaker: Optional[CircuitBreaker] = None
+        , rate_limiter: Optional[RateLimiter] = None
+        , connector_options: ConnectorOptions = ConnectorOptions()
+        , lanes: Optional[Mapping[RequestClass, LaneOptions]] = None
+        , base_url: str = BASE_URL
+    ):
+        self._base_url = base_url.rstrip("/")
         self._profile_name = profile_name
         self._auth_lost_callback = auth_lost_callback
-        cookies = aiohttp.CookieJar()
-        cookies.update_cookies(SimpleCookie(f"POESESSID={poesessid}; Domain=pathofexile.com;"))
-        super().__init__(limit=30, timeout=aiohttp.ClientTimeout(total=30), cookie_jar=cookies)
+        self._achievements_parser = ACHIEVEMENTS_PARSERS[parser]
+        self._parse_executor = ProcessPoolExecutor(max_workers=parse_processes) if parse_processes else None
+        self._parse_time_budget = parse_time_budget
+        self._achievements_snapshots: Dict[ProfileName, _PageSnapshot] = {}
+        self._achievements_requests: Dict[ProfileName, asyncio.Future] = {}
+        self._downloads: Dict[str, asyncio.Future] = {}
+        self._retry_policy = retry_policy
+        self._circuit_breaker = circuit_breaker or CircuitBreaker()
+        self._rate_limiter = rate_limiter or RateLimiter()
+        self._lanes = {
+            request_class: _Lane(options) for request_class, options in {**DEFAULT_LANES, **(lanes or {})}.items()
+        }
+        self._interactive_pending = 0
+        self._interactive_idle = asyncio.Event()
+        self._interactive_idle.set()
+        self._metrics = HttpMetrics()
+        self._metrics_path = metrics_path
+        self._metrics_dump = asyncio.ensure_future(
+            self._metrics.dump_periodically(metrics_path, metrics_interval)
+        ) if metrics_path else None
+        self._session = create_client_session(
+            connector=create_tcp_connector(
+                limit=connector_options.limit
+                , limit_per_host=connector_options.limit_per_host
+                , keepalive_timeout=connector_options.keepalive_timeout
+                , ttl_dns_cache=connector_options.ttl_dns_cache
+                , family=connector_options.family
+            )
+            , timeout=DEFAULT_LANES[RequestClass.INTERACTIVE].timeout
+            , cookie_jar=aiohttp.CookieJar(unsafe=self._is_ip_address(self._cookie_domain))
+            , trace_configs=[self._metrics.trace_config]
+        )
+        self._set_session_id(poesessid)
+
+    @property
+    def _cookie_domain(self) -> str:
+        host = urlsplit(self._base_url).hostname or ""
+        return host[len("www."):] if host.startswith("www.") else host
+
+    @staticmethod
+    def _is_ip_address(host: str) -> bool:
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return True
+
+    def _set_session_id(self, poesessid: PoeSessionId):
+        self._session.cookie_jar.clear()
+        self._session.cookie_jar.update_cookies(SimpleCookie(f"POESESSID={poesessid}; Domain={self._cookie_domain};"))
+
+    async def update_credentials(self, poesessid: PoeSessionId, profile_name: ProfileName, drain_timeout: float = 5):
+        self._set_session_id(poesessid)
+        self._profile_name = profile_name
+
+        # requests already on the wire carry the old session id: new callers must not join them
+        requests = list(self._achievements_requests.values())
+        self._achievements_requests.clear()
+        if not requests:
+            return
+
+        _, pending = await asyncio.wait(requests, timeout=drain_timeout)
+        for request in pending:
+            request.cancel()
 
-    async def _authenticated_request(self, method, *args, **kwargs) -> ClientResponse:
-        response = await super().request(method, *args, **kwargs)
+    @property
+    def metrics(self) -> HttpMetrics:
+        return self._metrics
+
+    @asynccontextmanager
+    async def _lane(self, request_class: RequestClass) -> AsyncIterator[LaneOptions]:
+        lane = self._lanes[request_class]
+        interactive = request_class == RequestClass.INTERACTIVE
+        if interactive:
+            self._interactive_pending += 1
+            self._interactive_idle.clear()
+
+        try:
+            if not interactive:
+                # bulk transfers queue behind any interactive request, they never hold up the latter
+                await self._interactive_idle.wait()
+            async with lane.semaphore:
+                yield lane.options
+        finally:
+            if interactive:
+                self._interactive_pending -= 1
+                if not self._interactive_pending:
+                    self._interactive_idle.set()
+
+    async def _send(self, method, *args, **kwargs) -> ClientResponse:
+        await self._rate_limiter.acquire()
+        with handle_exception():
+            response = await self._session.request(method, *args, raise_for_status=False, **kwargs)
+            self._rate_limiter.update(response.headers)
+            if response.status >= HTTPStatus.BAD_REQUEST:
+                response.release()
+                response.raise_for_status()
+
+        return response
+
+    async def _request(self, method, *args, **kwargs) -> ClientResponse:
+        retries = self._retry_policy.retries if method in IDEMPOTENT_METHODS else 0
+        attempt = 0
+        while True:
+            self._circuit_breaker.check()
+            try:
+                response = await self._send(method, *args, **kwargs)
+            except asyncio.CancelledError:
+                self._circuit_breaker.release()
+                raise
+            except TooManyRequests:
+                # the backend is healthy, the rate limiter knows how long to hold off for when it sent the headers
+                self._circuit_breaker.release()
+                if attempt >= retries:
+                    raise
+
+                if self._rate_limiter.get_delay() <= 0:
+                    delay = self._retry_policy.get_delay(attempt)
+                    logger.info("%s request rate limited without a delay advertised, retrying in %.2fs", method, delay)
+                    await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except RETRIABLE_ERRORS as e:
+                self._circuit_breaker.record_failure()
+                if attempt >= retries:
+                    raise
+
+                delay = self._retry_policy.get_delay(attempt)
+                logger.info("%s request failed with %r, retrying in %.2fs", method, e, delay)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except Exception:
+                # the backend did answer, just not with something we could use
+                self._circuit_breaker.record_success()
+                raise
+
+            self._circuit_breaker.record_success()
+            return response
+
+    async def _authenticated_request(self, method, *args, endpoint: str, **kwargs) -> ClientResponse:
+        response = await self._request(method, *args, trace_request_ctx=endpoint, **kwargs)
         if response.status == HTTPStatus.FOUND:
+            self._metrics.record_auth_lost(endpoint)
             self._auth_lost_callback()
             raise AuthenticationRequired()
 
         return response
 
-    async def _get_page(self, *args, **kwargs) -> HtmlPage:
-        return HtmlPage(await (
-            await self._authenticated_request("GET", *args, allow_redirects=False, **kwargs)
-        ).text(encoding="utf-8", errors="replace"))
+    @staticmethod
+    def _get_conditional_headers(snapshot: Optional[Union[_PageSnapshot, DownloadedFile]]) -> Dict[str, str]:
+        headers = {}
+        if snapshot and snapshot.etag:
+            headers[hdrs.IF_NONE_MATCH] = snapshot.etag
+        if snapshot and snapshot.last_modified:
+            headers[hdrs.IF_MODIFIED_SINCE] = snapshot.last_modified
+
+        return headers
+
+    @staticmethod
+    def _get_digest(page: HtmlPage, section: bytes) -> bytes:
+        start = page.find(section)
+        if start < 0:
+            return hashlib.sha1(page).digest()
+
+        # only the div holding the section counts, whatever the header and the footer around it change into
+        start = max(page.rfind(b"<", 0, start), 0)
+        end = len(page)
+        depth = 0
+        for tag in _DIV_TAG.finditer(page, start):
+            depth += -1 if tag.group(1) else 1
+            if not depth:
+                end = tag.end()
+                break
+
+        return hashlib.sha1(memoryview(page)[start:end]).digest()
+
+    @staticmethod
+    def _discard(response: ClientResponse):
+        if response.connection is not None:
+            # the rest of the body is still on the wire, the connection must not go back to the pool
+            response.close()
+        elif response.content.exception() is None:
+            # the body was received in full and its connection is pooled already, but with reading paused until
+            # the buffered rest of the body is consumed
+            response.content.read_nowait()
+
+    async def _stream_file(
+        self
+        , path: str
+        , response: ClientResponse
+        , progress_callback: Optional[ProgressCallback]
+        , throttle: Optional[Throttle]
+    ) -> DownloadedFile:
+        loop = asyncio.get_event_loop()
+        partial_path = path + ".part"
+        content_length = response.headers.get(hdrs.CONTENT_LENGTH)
+        total = int(content_length) if content_length and content_length.isdigit() else None
+        downloaded = 0
+        digest = hashlib.sha256()
+        try:
+            with open(partial_path, "wb") as file, handle_exception():
+                def write(chunk: bytes):
+                    file.write(chunk)
+                    digest.update(chunk)
+
+                async for chunk in response.content.iter_chunked(self._FILE_CHUNK_SIZE):
+                    await loop.run_in_executor(None, write, chunk)
+                    downloaded += len(chunk)
+                    if progress_callback:
+                        progress_callback(downloaded, total)
+                    if throttle:
+                        await throttle.consume(len(chunk))
+
+            os.replace(partial_path, path)
+        except BaseException:
+            self._discard(response)
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+        else:
+            response.release()
+
+        return DownloadedFile(
+            path=path
+            , sha256=digest.hexdigest()
+            , size=downloaded
+            , etag=response.headers.get(hdrs.ETAG)
+            , last_modified=response.headers.get(hdrs.LAST_MODIFIED)
+        )
 
-    async def _get_file(self, *args, **kwargs) -> bytes:
-        return await (
-            await self._authenticated_request("GET", *args, allow_redirects=False, **kwargs)
-        ).read()
+    async def _write_segment(
+        self
+        , partial_path: str
+        , response: ClientResponse
+        , offset: int
+        , on_chunk: Callable[[int], None]
+        , throttle: Optional[Throttle]
+    ):
+        loop = asyncio.get_event_loop()
+        try:
+            with open(partial_path, "r+b") as file, handle_exception():
+                file.seek(offset)
+                async for chunk in response.content.iter_chunked(self._FILE_CHUNK_SIZE):
+                    await loop.run_in_executor(None, file.write, chunk)
+                    on_chunk(len(chunk))
+                    if throttle:
+                        await throttle.consume(len(chunk))
+
+                # the segment is recorded as completed right after, it has to be on the disk by then
+                file.flush()
+                await loop.run_in_executor(None, os.fsync, file.fileno())
+        except BaseException:
+            self._discard(response)
+            raise
+        else:
+            response.release()
+
+    async def _download_segment(
+        self
+        , partial_path: str
+        , state: DownloadState
+        , index: int
+        , *args
+        , endpoint: str
+        , on_chunk: Callable[[int], None]
+        , throttle: Optional[Throttle]
+        , **kwargs
+    ):
+        first, last = state.get_range(index)
+        async with self._lane(RequestClass.BULK) as lane:
+            response = await self._authenticated_request(
+                "GET"
+                , *args
+                , endpoint=endpoint
+                , allow_redirects=False
+                , headers={hdrs.RANGE: f"bytes={first}-{last}"}
+                , timeout=lane.timeout
+                , **kwargs
+            )
+            if (
+                response.status != HTTPStatus.PARTIAL_CONTENT
+                or parse_content_range(response.headers.get(hdrs.CONTENT_RANGE)) != (first, last, state.size)
+                or response.headers.get(hdrs.ETAG) != state.etag
+            ):
+                response.release()
+                raise UnknownBackendResponse(f"Unexpected response to the range request for segment {index}")
+
+            await self._write_segment(partial_path, response, first, on_chunk, throttle)
+
+    async def _download_segmented(
+        self
+        , path: str
+        , *args
+        , endpoint: str
+        , cached: Optional[DownloadedFile]
+        , progress_callback: Optional[ProgressCallback]
+        , bandwidth: Optional[int]
+        , **kwargs
+    ) -> DownloadedFile:
+        loop = asyncio.get_event_loop()
+        throttle = Throttle(bandwidth) if bandwidth else None
+        partial_path = path + ".part"
+        state_path = path + ".segments"
+        state = load_state(state_path) if os.path.exists(partial_path) else None
+
+        async with self._lane(RequestClass.BULK) as lane:
+            while True:
+                pending = state.get_pending() if state else []
+                segment_size = state.segment_size if state else self._DOWNLOAD_SEGMENT_SIZE
+                # the first missing segment doubles as the probe for range support
+                first = (pending[0] if pending else 0) * segment_size
+                try:
+                    response = await self._authenticated_request(
+                        "GET"
+                        , *args
+                        , endpoint=endpoint
+                        , allow_redirects=False
+                        , headers={
+                            **self._get_conditional_headers(cached)
+                            , hdrs.RANGE: f"bytes={first}-{first + segment_size - 1}"
+                        }
+                        , timeout=lane.timeout
+                        , **kwargs
+                    )
+                except UnknownError:
+                    if state is None:
+                        raise
+                    # most likely 416, the saved range is past the end of a file that shrank on the server
+                    response = None
+                else:
+                    if cached and response.status == HTTPStatus.NOT_MODIFIED:
+                        response.release()
+                        return cached
+
+                    content_range = parse_content_range(response.headers.get(hdrs.CONTENT_RANGE))
+                    if (
+                        response.status != HTTPStatus.PARTIAL_CONTENT
+                        or content_range is None
+                        or content_range[0] != first
+                    ):
+                        logger.info("Ranges are not supported, downloading %s in a single stream", path)
+                        if os.path.exists(state_path):
+                            os.remove(state_path)
+                        return await self._stream_file(path, response, progress_callback, throttle)
+
+                    size = content_range[2]
+                    etag = response.headers.get(hdrs.ETAG)
+                    last_modified = response.headers.get(hdrs.LAST_MODIFIED)
+                    if state is None:
+                        state = DownloadState(size, segment_size, etag, last_modified)
+                        with open(partial_path, "wb") as file:
+                            file.truncate(size)
+                        break
+                    resumable = state.matches(size, etag, last_modified)
+                    if resumable and content_range[1] == state.get_range(first // segment_size)[1]:
+                        logger.info("Resuming the download of %s, %d segments left", path, len(pending))
+                        break
+                    response.release()
+
+                logger.info("%s changed on the server, restarting the download", path)
+                for stale_path in (partial_path, state_path):
+                    if os.path.exists(stale_path):
+                        os.remove(stale_path)
+                state = None
+
+            probe_index = first // segment_size
+            if content_range[1] != state.get_range(probe_index)[1]:
+                response.release()
+                raise UnknownBackendResponse("Unexpected response to the range probe")
+            save_state(state_path, state)
+
+            downloaded = state.get_completed_size()
 
-    async def get_achievements(self, *args, **kwargs) -> AchievementTagSet:
-        response = await self._get_page(
-            *args
-            , url=f"https://www.pathofexile.com/account/view-profile/{self._profile_name}/achievements"
-            , **kwargs)
+            def on_chunk(chunk_size: int):
+                nonlocal downloaded
+                downloaded += chunk_size
+                if progress_callback:
+                    progress_callback(downloaded, size)
+
+            def on_segment_done(index: int):
+                state.completed.add(index)
+                save_state(state_path, state)
+
+            segments = iter([index for index in state.get_pending() if index != probe_index])
+
+            async def fetch_segments():
+                for index in segments:
+                    await self._download_segment(
+                        partial_path
+                        , state
+                        , index
+                        , *args
+                        , endpoint=endpoint
+                        , on_chunk=on_chunk
+                        , throttle=throttle
+                        , **kwargs
+                    )
+                    on_segment_done(index)
+
+            workers = [
+                asyncio.ensure_future(fetch_segments())
+                for _ in range(min(self._lanes[RequestClass.BULK].options.concurrency, state.segments - 1))
+            ]
+            try:
+                await self._write_segment(partial_path, response, first, on_chunk, throttle)
+                on_segment_done(probe_index)
+            except BaseException:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                raise
 
         try:
-            return BeautifulSoup(response, "lxml").select("div.achievement:not(.incomplete)")
+            await asyncio.gather(*workers)
+        except BaseException:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+
+        sha256 = await loop.run_in_executor(None, hash_file, partial_path)
+        os.replace(partial_path, path)
+        os.remove(state_path)
+        return DownloadedFile(path=path, sha256=sha256, size=size, etag=etag, last_modified=last_modified)
+
+    async def _download_file(self, path: str, *args, **kwargs) -> DownloadedFile:
+        # both downloads would write the same partial file, the second caller joins the first one instead
+        download = self._downloads.get(path)
+        if download is None:
+            def on_done(done_download: asyncio.Future):
+                if self._downloads.get(path) is done_download:
+                    del self._downloads[path]
+                if not done_download.cancelled():
+                    done_download.exception()
+
+            download = asyncio.ensure_future(self._download_segmented(path, *args, **kwargs))
+            download.add_done_callback(on_done)
+            self._downloads[path] = download
+
+        return await asyncio.shield(download)
+
+    async def cancel_download(self, path: str):
+        download = self._downloads.pop(path, None)
+        if download is None:
+            return
+
+        download.cancel()
+        await asyncio.wait([download])
+
+    async def _parse(self, parser: AchievementsParser, page: HtmlPage):
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_event_loop().run_in_executor(self._parse_executor, parser, page)
         except Exception as e:
             raise UnknownBackendResponse(str(e))
+        finally:
+            elapsed = time.perf_counter() - started
+            if elapsed > self._parse_time_budget:
+                logger.warning(
+                    "Parsing %d bytes took %.3fs, over the %.3fs budget", len(page), elapsed, self._parse_time_budget
+                )
+
+    async def _fetch_achievements(self, profile_name: ProfileName) -> AchievementSet:
+        snapshot = self._achievements_snapshots.get(profile_name)
+
+        async with self._lane(RequestClass.INTERACTIVE) as lane:
+            try:
+                response = await self._authenticated_request(
+                    "GET"
+                    , url=self._base_url + self._ACHIEVEMENTS_PATH.format(profile_name=profile_name)
+                    , endpoint=self.ACHIEVEMENTS_ENDPOINT
+                    , allow_redirects=False
+                    , headers=self._get_conditional_headers(snapshot)
+                    , timeout=lane.timeout
+                )
+            except CircuitOpen:
+                if snapshot is None:
+                    raise
+                logger.info("Backend is unavailable, serving the last achievements snapshot")
+                return snapshot.content
+            if snapshot and response.status == HTTPStatus.NOT_MODIFIED:
+                response.release()
+                snapshot.refreshed_at = time.time()
+                return snapshot.content
+
+            page = HtmlPage(await response.read())
+
+        digest = self._get_digest(page, self._ACHIEVEMENTS_SECTION)
+        if snapshot and snapshot.digest == digest:
+            achievements = snapshot.content
+        else:
+            achievements = await self._parse(self._achievements_parser, page)
+
+        self._achievements_snapshots[profile_name] = _PageSnapshot(
+            etag=response.headers.get(hdrs.ETAG)
+            , last_modified=response.headers.get(hdrs.LAST_MODIFIED)
+            , digest=digest
+            , content=achievements
+            , refreshed_at=time.time()
+        )
+        return achievements
+
+    def get_achievements_refreshed_at(self) -> Optional[float]:
+        # a snapshot served while the backend is unavailable keeps the time of the fetch it came from
+        snapshot = self._achievements_snapshots.get(self._profile_name)
+        return snapshot.refreshed_at if snapshot else None
+
+    async def get_achievements(self) -> AchievementSet:
+        profile_name = self._profile_name
+
+        request = self._achievements_requests.get(profile_name)
+        if request is None:
+            def on_done(done_request: asyncio.Future):
+                if self._achievements_requests.get(profile_name) is done_request:
+                    del self._achievements_requests[profile_name]
+                if not done_request.cancelled():
+                    done_request.exception()
+
+            request = asyncio.ensure_future(self._fetch_achievements(profile_name))
+            request.add_done_callback(on_done)
+            self._achievements_requests[profile_name] = request
+
+        return await asyncio.shield(request)
 
-    async def get_installer(self, *args, **kwargs) -> bytes:
-        return await self._get_file(*args, url=self._INSTALL_BIN_URL, **kwargs)
+    async def _stream_achievements(self, queue: "asyncio.Queue[AchievementRecord]", *args, **kwargs):
+        async with self._lane(RequestClass.INTERACTIVE) as lane:
+            kwargs.setdefault("timeout", lane.timeout)
+            response = await self._authenticated_request(
+                "GET"
+                , *args
+                , url=self._base_url + self._ACHIEVEMENTS_PATH.format(profile_name=self._profile_name)
+                , endpoint=self.ACHIEVEMENTS_ENDPOINT
+                , allow_redirects=False
+                , **kwargs
+            )
+
+            parser = AchievementsStreamParser()
+            try:
+                async for chunk in response.content.iter_chunked(self._PAGE_CHUNK_SIZE):
+                    for achievement in parser.feed(chunk):
+                        queue.put_nowait(achievement)
+
+                    if parser.done:
+                        break
+                else:
+                    for achievement in parser.close():
+                        queue.put_nowait(achievement)
+
+            except (etree.LxmlError, ValueError) as e:
+                raise UnknownBackendResponse(str(e))
+
+            finally:
+                if response.content.at_eof():
+                    response.release()
+                else:
+                    response.close()
+
+    async def stream_achievements(self, *args, **kwargs) -> AsyncIterator[AchievementRecord]:
+        # the page is read and parsed at its own pace, a slow consumer must not keep the interactive lane taken
+        queue: "asyncio.Queue[Optional[AchievementRecord]]" = asyncio.Queue()
+        producer = asyncio.ensure_future(self._stream_achievements(queue, *args, **kwargs))
+        producer.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                achievement = await queue.get()
+                if achievement is None:
+                    break
+                yield achievement
+
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+                await asyncio.wait([producer])
+
+    async def download_installer(
+        self
+        , path: str
+        , *args
+        , cached: Optional[DownloadedFile] = None
+        , progress_callback: Optional[ProgressCallback] = None
+        , bandwidth: Optional[int] = None
+        , **kwargs
+    ) -> DownloadedFile:
+        return await self._download_file(
+            path
+            , *args
+            , url=self._base_url + self._INSTALL_BIN_PATH
+            , endpoint=self.INSTALLER_ENDPOINT
+            , cached=cached
+            , progress_callback=progress_callback
+            , bandwidth=bandwidth
+            , **kwargs
+        )
+
+    async def close(self):
+        await self._session.close()
 
     async def shutdown(self):
-        await super().close()
+        for request in self._achievements_requests.values():
+            request.cancel()
+        for download in self._downloads.values():
+            download.cancel()
+
+        await self.close()
+        if self._metrics_dump:
+            self._metrics_dump.cancel()
+            try:
+                self._metrics.dump(self._metrics_path)
+            except OSError:
+                logger.exception("Failed to dump http metrics to %s", self._metrics_path)
+        if self._parse_executor:
+            self._parse_executor.shutdown(wait=False)
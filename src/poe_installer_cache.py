@@ -0,0 +1,160 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from poe_download import hash_file
+from poe_types import DownloadedFile
+
+logger = logging.getLogger(__name__)
+
+_INDEX = "index.json"
+_STAGING_SUFFIX = ".download"
+_RESUMABLE_SUFFIXES = (_STAGING_SUFFIX + ".part", _STAGING_SUFFIX + ".segments")
+
+
+class InstallerCache:
+    def __init__(self, root: str, max_size: int):
+        self._root = root
+        self._max_size = max_size
+        self._entries: Optional[Dict[str, DownloadedFile]] = None
+        self._last_used: Dict[str, float] = {}
+
+    def _get_blob_path(self, key: str, sha256: str) -> str:
+        return os.path.join(self._root, sha256 + os.path.splitext(key)[1])
+
+    def _load(self) -> Dict[str, DownloadedFile]:
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        try:
+            with open(os.path.join(self._root, _INDEX)) as index:
+                records = json.load(index)
+        except (OSError, ValueError):
+            records = {}
+
+        for key, record in records.items() if isinstance(records, dict) else ():
+            try:
+                entry = DownloadedFile(
+                    path=self._get_blob_path(key, record["sha256"])
+                    , sha256=record["sha256"]
+                    , size=int(record["size"])
+                    , etag=record.get("etag")
+                    , last_modified=record.get("last_modified")
+                )
+                last_used = float(record.get("last_used", 0))
+            except (KeyError, TypeError, ValueError):
+                continue
+            if os.path.isfile(entry.path):
+                self._entries[key] = entry
+                self._last_used[key] = last_used
+
+        self._cleanup()
+        return self._entries
+
+    def _save(self):
+        os.makedirs(self._root, exist_ok=True)
+        index_path = os.path.join(self._root, _INDEX)
+        with open(index_path + ".tmp", "w") as index:
+            json.dump({
+                key: {
+                    "sha256": entry.sha256
+                    , "size": entry.size
+                    , "etag": entry.etag
+                    , "last_modified": entry.last_modified
+                    , "last_used": self._last_used.get(key, 0)
+                }
+                for key, entry in self._entries.items()
+            }, index, indent=4)
+        os.replace(index_path + ".tmp", index_path)
+
+    def _remove_file(self, path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            # most likely an installer that is still running, the next cleanup picks it up
+            logger.warning("Failed to remove %s from the installer cache", path)
+
+    def _cleanup(self):
+        # blobs no entry points to anymore, interrupted downloads are kept to be resumed
+        referenced = {entry.path for entry in self._entries.values()} | {os.path.join(self._root, _INDEX)}
+        try:
+            file_names = os.listdir(self._root)
+        except OSError:
+            return
+
+        for file_name in file_names:
+            path = os.path.join(self._root, file_name)
+            if path not in referenced and not file_name.endswith(_RESUMABLE_SUFFIXES) and os.path.isfile(path):
+                self._remove_file(path)
+
+    def _remove_entry(self, key: str):
+        entry = self._entries.pop(key)
+        self._last_used.pop(key, None)
+        if all(other.path != entry.path for other in self._entries.values()):
+            self._remove_file(entry.path)
+
+    def _evict(self, keep: str):
+        blob_sizes = {entry.path: entry.size for entry in self._entries.values()}
+        total_size = sum(blob_sizes.values())
+        # the entry just stored is kept even if it alone exceeds the limit, it is about to be used
+        for key in sorted(self._entries, key=lambda cached_key: self._last_used.get(cached_key, 0)):
+            if total_size <= self._max_size:
+                break
+            if key == keep:
+                continue
+
+            path = self._entries[key].path
+            self._remove_entry(key)
+            if path in blob_sizes and all(entry.path != path for entry in self._entries.values()):
+                total_size -= blob_sizes.pop(path)
+
+    def get_staging_path(self, key: str) -> str:
+        self._load()
+        os.makedirs(self._root, exist_ok=True)
+        return os.path.join(self._root, key + _STAGING_SUFFIX)
+
+    async def get(self, key: str) -> Optional[DownloadedFile]:
+        entry = self._load().get(key)
+        if entry is None:
+            return None
+
+        try:
+            valid = os.path.getsize(entry.path) == entry.size and (
+                await asyncio.get_event_loop().run_in_executor(None, hash_file, entry.path) == entry.sha256
+            )
+        except OSError:
+            valid = False
+        if not valid:
+            logger.warning("Cached %s is corrupted, dropping it", key)
+            self._remove_entry(key)
+            self._save()
+            return None
+
+        return entry
+
+    def put(self, key: str, downloaded: DownloadedFile) -> str:
+        entries = self._load()
+        blob_path = self._get_blob_path(key, downloaded.sha256)
+        if downloaded.path != blob_path:
+            if os.path.isfile(blob_path):
+                self._remove_file(downloaded.path)
+            else:
+                os.replace(downloaded.path, blob_path)
+
+        previous = entries.get(key)
+        entries[key] = downloaded._replace(path=blob_path)
+        self._last_used[key] = time.time()
+        if previous and previous.path != blob_path and all(
+            entry.path != previous.path for entry in entries.values()
+        ):
+            self._remove_file(previous.path)
+
+        self._evict(keep=key)
+        self._save()
+        return blob_path
@@ -0,0 +1,159 @@
+import asyncio
+import bisect
+import json
+import logging
+import os
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Dict, Tuple
+
+import aiohttp
+from aiohttp import hdrs
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+_SIZE_BUCKETS = (1024, 4 * 1024, 16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 16 * 1024 * 1024)
+
+
+class Histogram:
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        self._buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self._buckets[bisect.bisect_left(self._bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count
+            , "sum": self.sum
+            , "max": self.max
+            , "buckets": dict(zip([str(bound) for bound in self._bounds] + ["+Inf"], self._buckets))
+        }
+
+
+@dataclass
+class EndpointMetrics:
+    requests: int = 0
+    errors: int = 0
+    redirects: int = 0
+    auth_lost: int = 0
+    response_bytes: int = 0
+    statuses: Counter = field(default_factory=Counter)
+    latency: Dict[str, Histogram] = field(default_factory=lambda: defaultdict(lambda: Histogram(_LATENCY_BUCKETS)))
+    response_size: Histogram = field(default_factory=lambda: Histogram(_SIZE_BUCKETS))
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests
+            , "errors": self.errors
+            , "redirects": self.redirects
+            , "auth_lost": self.auth_lost
+            , "response_bytes": self.response_bytes
+            , "statuses": {str(status): count for status, count in sorted(self.statuses.items())}
+            , "latency": {phase: histogram.to_dict() for phase, histogram in sorted(self.latency.items())}
+            , "response_size": self.response_size.to_dict()
+        }
+
+
+class HttpMetrics:
+    UNKNOWN_ENDPOINT = "unknown"
+
+    def __init__(self):
+        self._endpoints: Dict[str, EndpointMetrics] = defaultdict(EndpointMetrics)
+        self._trace_config = aiohttp.TraceConfig()
+        self._trace_config.on_request_start.append(self._on_request_start)
+        self._trace_config.on_request_end.append(self._on_request_end)
+        self._trace_config.on_request_exception.append(self._on_request_exception)
+        self._trace_config.on_request_redirect.append(self._on_request_redirect)
+        self._trace_config.on_connection_queued_start.append(self._on_phase_start("pool_wait"))
+        self._trace_config.on_connection_queued_end.append(self._on_phase_end("pool_wait"))
+        self._trace_config.on_connection_create_start.append(self._on_phase_start("connect"))
+        self._trace_config.on_connection_create_end.append(self._on_phase_end("connect"))
+        self._trace_config.on_dns_resolvehost_start.append(self._on_phase_start("dns"))
+        self._trace_config.on_dns_resolvehost_end.append(self._on_phase_end("dns"))
+        self._trace_config.on_response_chunk_received.append(self._on_response_chunk_received)
+        self._trace_config.freeze()
+
+    @property
+    def trace_config(self) -> aiohttp.TraceConfig:
+        return self._trace_config
+
+    def _get_endpoint(self, context: SimpleNamespace) -> EndpointMetrics:
+        return self._endpoints[context.trace_request_ctx or self.UNKNOWN_ENDPOINT]
+
+    async def _on_request_start(self, session, context, params):
+        context.started = time.perf_counter()
+        context.phases = {}
+        self._get_endpoint(context).requests += 1
+
+    def _on_phase_start(self, phase: str):
+        async def on_phase_start(session, context, params):
+            context.phases[phase] = time.perf_counter()
+
+        return on_phase_start
+
+    def _on_phase_end(self, phase: str):
+        async def on_phase_end(session, context, params):
+            started = context.phases.get(phase)
+            if started is not None:
+                context.phases[phase] = time.perf_counter()
+                self._get_endpoint(context).latency[phase].observe(context.phases[phase] - started)
+
+        return on_phase_end
+
+    async def _on_request_end(self, session, context, params):
+        now = time.perf_counter()
+        endpoint = self._get_endpoint(context)
+
+        endpoint.statuses[params.response.status] += 1
+        # time to first byte is counted from the moment the connection was ready
+        endpoint.latency["ttfb"].observe(now - max(
+            [context.started] + [context.phases[phase] for phase in ("pool_wait", "connect") if phase in context.phases]
+        ))
+        endpoint.latency["total"].observe(now - context.started)
+
+        content_length = params.response.headers.get(hdrs.CONTENT_LENGTH)
+        if content_length and content_length.isdigit():
+            endpoint.response_size.observe(int(content_length))
+
+    async def _on_request_exception(self, session, context, params):
+        endpoint = self._get_endpoint(context)
+        endpoint.errors += 1
+        endpoint.latency["total"].observe(time.perf_counter() - context.started)
+
+    async def _on_request_redirect(self, session, context, params):
+        self._get_endpoint(context).redirects += 1
+
+    async def _on_response_chunk_received(self, session, context, params):
+        self._get_endpoint(context).response_bytes += len(params.chunk)
+
+    def record_auth_lost(self, endpoint: str):
+        self._endpoints[endpoint].auth_lost += 1
+
+    def snapshot(self) -> dict:
+        return {name: endpoint.to_dict() for name, endpoint in sorted(self._endpoints.items())}
+
+    def dump(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", "w") as metrics_file:
+            json.dump({"timestamp": int(time.time()), "endpoints": self.snapshot()}, metrics_file, indent=4)
+        os.replace(path + ".tmp", path)
+
+    async def dump_periodically(self, path: str, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.dump(path)
+            except OSError:
+                logger.exception("Failed to dump http metrics to %s", path)
+
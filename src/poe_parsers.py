@@ -0,0 +1,186 @@
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, Optional
+
+import lxml.html
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from poe_types import (
+    AchievementName, AchievementProgress, AchievementRecord, AchievementSet, AchievementsParser, HtmlPage
+)
+
+
+def get_achievement_record(name_text: Optional[str], progress_text: Optional[str]) -> AchievementRecord:
+    if name_text is None:
+        raise ValueError("Cannot find achievement name tag")
+    # the markup may wrap the name in new lines and indentation, none of which is a part of it
+    name_text = " ".join(name_text.split())
+    if not name_text:
+        raise ValueError("Failed to parse achievement name")
+
+    progress = None
+    if progress_text:
+        try:
+            done, total = progress_text.split("/", maxsplit=1)
+            progress = AchievementProgress((int(done), int(total)))
+        except ValueError:
+            pass
+
+    return AchievementRecord(AchievementName(name_text), progress)
+
+
+def parse_achievements_bs4(page: HtmlPage) -> AchievementSet:
+    def get_text(tag) -> Optional[str]:
+        return tag.get_text() if tag else None
+
+    soup = BeautifulSoup(page, "lxml", from_encoding="utf-8")
+    try:
+        return tuple(
+            get_achievement_record(
+                get_text(achievement_tag.h2)
+                , get_text(achievement_tag.select_one("h2.completion-detail"))
+            )
+            for achievement_tag in soup.select("div.achievement:not(.incomplete)")
+        )
+    finally:
+        soup.decompose()
+
+
+def _has_class(class_name: str) -> str:
+    return f'contains(concat(" ", normalize-space(@class), " "), " {class_name} ")'
+
+
+_COMPLETED_ACHIEVEMENTS = etree.XPath(f'//div[{_has_class("achievement")} and not({_has_class("incomplete")})]')
+_ACHIEVEMENT_NAME = etree.XPath("(.//h2)[1]")
+_ACHIEVEMENT_PROGRESS = etree.XPath(f'(.//h2[{_has_class("completion-detail")}])[1]')
+
+
+def parse_achievements_lxml(page: HtmlPage) -> AchievementSet:
+    if not page.strip():
+        return ()
+
+    def get_text(elements) -> Optional[str]:
+        return elements[0].text_content() if elements else None
+
+    return tuple(
+        get_achievement_record(
+            get_text(_ACHIEVEMENT_NAME(achievement_element))
+            , get_text(_ACHIEVEMENT_PROGRESS(achievement_element))
+        )
+        for achievement_element in _COMPLETED_ACHIEVEMENTS(
+            lxml.html.document_fromstring(page, parser=lxml.html.HTMLParser(encoding="utf-8"))
+        )
+    )
+
+
+class _AchievementsHtmlParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.achievements: List[AchievementRecord] = []
+        self._div_depth = 0
+        self._achievement_depth: Optional[int] = None
+        self._name_parts: Optional[List[str]] = None
+        self._progress_parts: Optional[List[str]] = None
+        self._text_parts: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        classes = (dict(attrs).get("class") or "").split()
+        if tag == "div":
+            self._div_depth += 1
+            if self._achievement_depth is None and "achievement" in classes and "incomplete" not in classes:
+                self._achievement_depth = self._div_depth
+                self._name_parts = None
+                self._progress_parts = None
+
+        elif tag == "h2" and self._achievement_depth is not None:
+            if self._name_parts is None:
+                self._name_parts = self._text_parts = []
+            elif "completion-detail" in classes and self._progress_parts is None:
+                self._progress_parts = self._text_parts = []
+
+    def handle_endtag(self, tag):
+        if tag == "h2":
+            self._text_parts = None
+
+        elif tag == "div":
+            if self._div_depth == self._achievement_depth:
+                self.achievements.append(get_achievement_record(
+                    "".join(self._name_parts) if self._name_parts is not None else None
+                    , "".join(self._progress_parts) if self._progress_parts is not None else None
+                ))
+                self._achievement_depth = None
+
+            self._div_depth = max(self._div_depth - 1, 0)
+
+    def handle_data(self, data):
+        if self._text_parts is not None:
+            self._text_parts.append(data)
+
+
+def parse_achievements_html(page: HtmlPage) -> AchievementSet:
+    parser = _AchievementsHtmlParser()
+    parser.feed(page.decode("utf-8", errors="replace"))
+    parser.close()
+    return tuple(parser.achievements)
+
+
+ACHIEVEMENTS_PARSERS: Dict[str, AchievementsParser] = {
+    "bs4": parse_achievements_bs4
+    , "lxml": parse_achievements_lxml
+    , "html.parser": parse_achievements_html
+}
+
+
+class AchievementsStreamParser:
+    def __init__(self):
+        self._parser = etree.HTMLPullParser(events=("end",), encoding="utf-8")
+        self._done = False
+        self._empty = True
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def feed(self, chunk: bytes) -> List[AchievementRecord]:
+        self._parser.feed(chunk)
+        self._empty = self._empty and not chunk
+        return list(self._read_events())
+
+    def close(self) -> List[AchievementRecord]:
+        if self._empty:
+            return []
+
+        self._parser.close()
+        return list(self._read_events())
+
+    def _read_events(self) -> Iterator[AchievementRecord]:
+        for _, element in self._parser.read_events():
+            if self._done or element.tag != "div":
+                continue
+
+            classes = element.get("class", "").split()
+            if "achievement-list" in classes:
+                self._done = True
+                continue
+
+            if "achievement" not in classes:
+                continue
+
+            if "incomplete" not in classes:
+                yield self._get_record(element)
+
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+    @staticmethod
+    def _get_record(achievement_element) -> AchievementRecord:
+        name_text = None
+        progress_text = None
+        for name_element in achievement_element.iterfind(".//h2"):
+            if name_text is None:
+                name_text = "".join(name_element.itertext())
+            elif progress_text is None and "completion-detail" in name_element.get("class", "").split():
+                progress_text = "".join(name_element.itertext())
+
+        return get_achievement_record(name_text, progress_text)
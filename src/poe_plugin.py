@@ -1,23 +1,33 @@
 import asyncio
 import json
+import logging
 import os
 import platform
 import re
 import subprocess
 import sys
-import tempfile
-from datetime import datetime
+import time
 from typing import Dict, List, Optional, Union
+from urllib.parse import quote
 
 from galaxy.api.consts import Platform
-from galaxy.api.errors import AuthenticationRequired, InvalidCredentials, UnknownBackendResponse
+from galaxy.api.errors import (
+    AuthenticationRequired, BackendError, BackendNotAvailable, BackendTimeout, InvalidCredentials, NetworkError
+)
 from galaxy.api.plugin import create_and_run_plugin, Plugin
 from galaxy.api.types import (
     Achievement, Authentication, Game, LicenseInfo, LicenseType, LocalGame, LocalGameState, NextStep
 )
-from galaxy.proc_tools import process_iter
-from poe_http_client import AchievementTagSet, PoeHttpClient
-from poe_types import AchievementName, AchievementTag, PoeSessionId, ProfileName, Timestamp
+from poe_catalog import AchievementCatalog
+from poe_http_client import ConnectorOptions, PoeHttpClient
+from poe_installer_cache import InstallerCache
+from poe_processes import GalaxyProcessSource, ProcessScanner
+from poe_registry import UninstallEntryIndex, WinRegistryBackend
+from poe_types import AchievementName, AchievementRecord, AchievementSet, PoeSessionId, ProfileName, Timestamp
+from poe_unlock_store import UnlockTimeStore
+
+
+logger = logging.getLogger(__name__)
 
 
 def is_windows() -> bool:
@@ -25,7 +35,6 @@ def is_windows() -> bool:
 
 
 if is_windows():
-    import aiofiles
     import winreg
 
 
@@ -44,16 +53,80 @@ class PoePlugin(Plugin):
     _PROC_NAMES = ["pathofexile.exe", "pathofexile_x64.exe"] if is_windows() else []
 
     _INSTALLER_BIN = "PathOfExileInstaller.exe"
+    _UNINSTALL_DISPLAY_NAME = "Path of Exile"
+    _INSTALLER_CACHE_MAX_SIZE = 256 * 1024 * 1024
+    _INSTALLER_PREFETCH = False
+    _INSTALLER_PREFETCH_BANDWIDTH = 512 * 1024
+
+    _ACHIEVEMENTS_CATALOG = "achievements.cat"
+    _ACHIEVEMENTS_CACHE_TTL = 5 * 60
+    _ACHIEVEMENTS_CACHE_MAX_STALENESS = 7 * 24 * 60 * 60
+    _ACHIEVEMENTS_REFRESHED_AT = "achievements_refreshed_at/{profile_name}"
+    _ACHIEVEMENTS_PREFETCH = True
+    _ACHIEVEMENTS_STREAMING = False
+    _ACHIEVEMENTS_PARSER = "lxml"
+    _ACHIEVEMENTS_PARSE_PROCESSES = 0
+    _ACHIEVEMENTS_PARSE_TIME_BUDGET = 0.5
+    _HTTP_METRICS_DUMP = False
+    _HTTP_CONNECTOR_OPTIONS = ConnectorOptions()
+    _ACHIEVEMENTS_POLL = False
+    _ACHIEVEMENTS_POLL_INTERVAL_RUNNING = 60
+    _ACHIEVEMENTS_POLL_INTERVAL_IDLE = 5 * 60
+    _ACHIEVEMENTS_POLL_INTERVAL_MAX = 60 * 60
 
     def __init__(self, reader, writer, token):
         self._http_client: Optional[PoeHttpClient] = None
+        self._authenticated = False
+        self._process_scanner = ProcessScanner(GalaxyProcessSource(), self._PROC_NAMES)
         self._install_path: Optional[str] = self._get_install_path() if is_windows() else None
         self._game_state: LocalGameState = self._get_game_state() if is_windows() else None
         self._manifest = self._read_manifest()
-        self._achievements_cache: Dict[AchievementName, Timestamp] = {}
+        self._achievements_catalog = AchievementCatalog(
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), self._ACHIEVEMENTS_CATALOG)
+        )
+        self._installer_cache = InstallerCache(
+            os.path.join(self._get_data_dir(), "installer"), self._INSTALLER_CACHE_MAX_SIZE
+        )
+        self._uninstall_entry = UninstallEntryIndex(
+            WinRegistryBackend(), self._UNINSTALL_DISPLAY_NAME, value_names=["BundleCachePath"]
+        ) if is_windows() else None
+        self._installer_prefetch: Optional[asyncio.Task] = None
+        self._installer_prefetched = False
+        self._installer_foreground = 0
+        self._achievements_store: Optional[UnlockTimeStore] = None
+        self._achievements_snapshot: Optional[AchievementSet] = None
+        self._achievements_refreshed_at_key: Optional[str] = None
+        self._achievements_revalidation: Optional[asyncio.Task] = None
+        self._achievements_prefetch: Optional[asyncio.Task] = None
+        self._achievements_poller: Optional[asyncio.Task] = None
+        self._achievements_poll_wakeup: Optional[asyncio.Event] = None
         super().__init__(Platform(self._manifest["platform"]), self._manifest["version"], reader, writer, token)
 
+    def _get_data_dir(self) -> str:
+        return os.path.join(
+            os.path.expandvars("%LOCALAPPDATA%") if is_windows()
+            else os.path.join(os.path.expanduser("~"), "Library", "Application Support")
+            , "GOG.com", "Galaxy", "plugins", "data", f"{self._manifest['platform']}_{self._manifest['guid']}"
+        )
+
+    def _cancel_achievements_tasks(self):
+        if self._achievements_poller:
+            self._achievements_poller.cancel()
+            self._achievements_poller = None
+
+        if self._achievements_revalidation:
+            self._achievements_revalidation.cancel()
+            self._achievements_revalidation = None
+
+        if self._achievements_prefetch:
+            self._achievements_prefetch.cancel()
+            self._achievements_prefetch = None
+
     async def _close_client(self):
+        self._cancel_achievements_tasks()
+        self._authenticated = False
+        await self._stop_installer_prefetch()
+
         if not self._http_client:
             return
 
@@ -61,7 +134,10 @@ class PoePlugin(Plugin):
         self._http_client = None
 
     def _on_auth_lost(self):
-        asyncio.create_task(self._close_client())
+        # the client and its connection pool are kept, the next auth only swaps the credentials
+        self._cancel_achievements_tasks()
+        self._authenticated = False
+        self._update_installer_prefetch()
         self.lost_authentication()
 
     async def _do_auth(
@@ -72,7 +148,32 @@ class PoePlugin(Plugin):
         if not profile_name:
             raise InvalidCredentials(self._AUTH_PROFILE_NAME)
 
-        self._http_client = PoeHttpClient(poesessid, profile_name, self._on_auth_lost)
+        if self._http_client:
+            await self._http_client.update_credentials(poesessid, profile_name)
+        else:
+            http_client_options = {
+                "parser": self._ACHIEVEMENTS_PARSER
+                , "parse_processes": self._ACHIEVEMENTS_PARSE_PROCESSES
+                , "parse_time_budget": self._ACHIEVEMENTS_PARSE_TIME_BUDGET
+                , "connector_options": self._HTTP_CONNECTOR_OPTIONS
+            }
+            if self._HTTP_METRICS_DUMP:
+                http_client_options["metrics_path"] = os.path.join(self._get_data_dir(), "http_metrics.json")
+
+            self._http_client = PoeHttpClient(poesessid, profile_name, self._on_auth_lost, **http_client_options)
+        self._authenticated = True
+        self._achievements_store = UnlockTimeStore(
+            os.path.join(self._get_data_dir(), "achievements", quote(profile_name, safe="") + ".log")
+        )
+        self._achievements_snapshot = None
+        self._achievements_refreshed_at_key = self._ACHIEVEMENTS_REFRESHED_AT.format(profile_name=profile_name)
+        if self._ACHIEVEMENTS_PREFETCH:
+            self._achievements_prefetch = asyncio.create_task(self._prefetch_achievements())
+        if self._ACHIEVEMENTS_POLL and not self._achievements_poller:
+            self._achievements_poll_wakeup = asyncio.Event()
+            self._achievements_poller = asyncio.create_task(self._poll_achievements())
+
+        self._update_installer_prefetch()
 
         if store_poesessid:
             self.store_credentials({self._AUTH_SESSION_ID: poesessid, self._AUTH_PROFILE_NAME: profile_name})
@@ -134,36 +235,131 @@ class PoePlugin(Plugin):
         )]
 
     def requires_authentication(self):
-        if not self._http_client:
+        if not self._http_client or not self._authenticated:
             raise AuthenticationRequired()
 
-    async def prepare_achievements_context(self, game_ids: List[str]) -> AchievementTagSet:
+    def _get_achievements_refreshed_at(self) -> float:
+        try:
+            return float(self.persistent_cache.get(self._achievements_refreshed_at_key, 0))
+        except ValueError:
+            return 0
+
+    async def _get_achievements(self) -> AchievementSet:
+        if self._ACHIEVEMENTS_STREAMING:
+            # parsed while the page downloads, but without the conditional requests and snapshots of the client
+            achievements = tuple([achievement async for achievement in self._http_client.stream_achievements()])
+            refreshed_at = time.time()
+        else:
+            achievements = await self._http_client.get_achievements()
+            refreshed_at = self._http_client.get_achievements_refreshed_at()
+
+        self._achievements_snapshot = achievements
+        if refreshed_at is not None and int(refreshed_at) > self._get_achievements_refreshed_at():
+            self.persistent_cache[self._achievements_refreshed_at_key] = str(int(refreshed_at))
+            self.push_cache()
+
+        return achievements
+
+    async def _prefetch_achievements(self):
+        try:
+            await self._get_achievements()
+        except AuthenticationRequired:
+            pass
+        except Exception:
+            logger.exception("Failed to prefetch achievements")
+
+    async def _revalidate_achievements(self):
+        try:
+            await self._refresh_achievements()
+        except AuthenticationRequired:
+            pass
+        except Exception:
+            logger.exception("Failed to revalidate achievements")
+
+    async def prepare_achievements_context(self, game_ids: List[str]) -> AchievementSet:
         self.requires_authentication()
 
-        return await self._http_client.get_achievements()
+        if self._achievements_prefetch:
+            prefetch, self._achievements_prefetch = self._achievements_prefetch, None
+            await prefetch
+            # the prefetch may have lost the authentication in the meantime
+            self.requires_authentication()
 
-    async def get_unlocked_achievements(self, game_id: str, achievement_tags: AchievementTagSet) -> List[Achievement]:
-        def achievement_parser(achievement_tag: Optional[AchievementTag]) -> Achievement:
-            name_tag = achievement_tag.h2
-            if not name_tag:
-                raise UnknownBackendResponse("Cannot find achievement name tag")
+        refreshed_at = self._get_achievements_refreshed_at()
+        age = time.time() - refreshed_at
+        if not refreshed_at or age > self._ACHIEVEMENTS_CACHE_MAX_STALENESS:
+            return await self._get_achievements()
 
-            achievement_name = achievement_tag.h2.get_text()
-            if not achievement_name:
-                raise UnknownBackendResponse("Failed to parse achievement name")
-
-            return Achievement(
-                unlock_time=self._achievements_cache.setdefault(
-                    achievement_name
-                    , Timestamp(int(datetime.utcnow().timestamp()))
-                )
-                , achievement_name=achievement_name
+        if self._achievements_snapshot is None:
+            self._achievements_snapshot = tuple(
+                AchievementRecord(achievement_name, None) for achievement_name in self._achievements_store
             )
 
-        return [
-            achievement_parser(achievement_tag)
-            for achievement_tag in achievement_tags
+        if age > self._ACHIEVEMENTS_CACHE_TTL and (
+            not self._achievements_revalidation or self._achievements_revalidation.done()
+        ):
+            self._achievements_revalidation = asyncio.create_task(self._revalidate_achievements())
+
+        return self._achievements_snapshot
+
+    async def get_unlocked_achievements(self, game_id: str, achievements: AchievementSet) -> List[Achievement]:
+        achievement_names = [achievement.name for achievement in achievements]
+        self._achievements_store.record(achievement_names, Timestamp(int(time.time())))
+
+        return [self._get_achievement(achievement_name) for achievement_name in achievement_names]
+
+    def _get_achievement(self, achievement_name: AchievementName) -> Achievement:
+        achievement_id = self._achievements_catalog.id_of(achievement_name)
+        unlock_time = self._achievements_store.get(achievement_name)
+        return Achievement(
+            unlock_time=unlock_time if unlock_time is not None else Timestamp(int(time.time()))
+            , achievement_id=str(achievement_id) if achievement_id is not None else None
+            , achievement_name=achievement_name
+        )
+
+    def _push_new_achievements(self, achievements: AchievementSet) -> int:
+        new_achievement_names = [
+            achievement.name
+            for achievement in achievements
+            if achievement.name not in self._achievements_store
         ]
+        self._achievements_store.record(new_achievement_names, Timestamp(int(time.time())))
+
+        for achievement_name in new_achievement_names:
+            self.unlock_achievement(self._GAME_ID, self._get_achievement(achievement_name))
+
+        return len(new_achievement_names)
+
+    async def _refresh_achievements(self) -> int:
+        self.requires_authentication()
+
+        return self._push_new_achievements(await self._get_achievements())
+
+    async def _poll_achievements(self):
+        idle_interval = self._ACHIEVEMENTS_POLL_INTERVAL_IDLE
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._achievements_poll_wakeup.wait()
+                    , self._ACHIEVEMENTS_POLL_INTERVAL_RUNNING if self._game_state == LocalGameState.Running
+                    else idle_interval
+                )
+                self._achievements_poll_wakeup.clear()
+                continue
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                new_achievements = await self._refresh_achievements()
+            except AuthenticationRequired:
+                return
+            except Exception:
+                logger.exception("Failed to poll achievements")
+                new_achievements = 0
+
+            idle_interval = self._ACHIEVEMENTS_POLL_INTERVAL_IDLE if new_achievements else min(
+                idle_interval * 2, self._ACHIEVEMENTS_POLL_INTERVAL_MAX
+            )
 
     if is_windows():
         def tick(self):
@@ -174,6 +370,9 @@ class PoePlugin(Plugin):
             if self._game_state != current_game_state:
                 self._game_state = current_game_state
                 self.update_local_game_status(LocalGame(self._GAME_ID, self._game_state))
+                self._update_installer_prefetch()
+                if self._achievements_poll_wakeup and current_game_state == LocalGameState.Running:
+                    self._achievements_poll_wakeup.set()
 
         @staticmethod
         def _get_install_path() -> Optional[str]:
@@ -191,15 +390,7 @@ class PoePlugin(Plugin):
             return os.path.exists(os.path.join(self._install_path, self._GAME_BIN))
 
         def _is_running(self) -> bool:
-            for proc in process_iter():
-                if proc.binary_path is None:
-                    continue
-
-                for proc_name in self._PROC_NAMES:
-                    if proc.binary_path.lower().endswith(os.path.join(os.path.sep, proc_name)):
-                        return True
-
-            return False
+            return self._process_scanner.is_running()
 
         def _get_game_state(self) -> LocalGameState:
             if not self._is_installed():
@@ -230,36 +421,30 @@ class PoePlugin(Plugin):
 
         async def _get_installer(self) -> str:
             def get_cached() -> Optional[str]:
-                try:
-                    with winreg.OpenKey(
-                        winreg.HKEY_LOCAL_MACHINE
-                        , r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"
-                    ) as h_info_root:
-                        for idx in range(winreg.QueryInfoKey(h_info_root)[0]):
-                            try:
-                                with winreg.OpenKeyEx(h_info_root, winreg.EnumKey(h_info_root, idx)) as h_sub_node:
-                                    def get_value(key):
-                                        return winreg.QueryValueEx(h_sub_node, key)[0]
-
-                                    if get_value("DisplayName") == "Path of Exile" and get_value("Installed"):
-                                        installer_path = get_value("BundleCachePath")
-                                        if os.path.exists(str(installer_path)):
-                                            return installer_path
-
-                            except (WindowsError, KeyError, ValueError):
-                                continue
-
-                except (WindowsError, KeyError, ValueError):
-                    return None
+                entry = self._uninstall_entry.find()
+                if entry and not os.path.exists(str(entry.get("BundleCachePath"))):
+                    entry = self._uninstall_entry.find(refresh=True)
+
+                installer_path = entry.get("BundleCachePath") if entry else None
+                return installer_path if installer_path and os.path.exists(str(installer_path)) else None
 
             async def download():
                 self.requires_authentication()
 
-                installer_path = os.path.join(tempfile.mkdtemp(), self._INSTALLER_BIN)
-                async with aiofiles.open(installer_path, mode="wb") as installer_bin:
-                    await installer_bin.write(await self._http_client.get_installer())
+                reported = [0]
+
+                def log_progress(downloaded: int, total: Optional[int]):
+                    if total and downloaded * 10 // total > reported[0]:
+                        reported[0] = downloaded * 10 // total
+                        logger.info("Downloaded %d%% of the installer", reported[0] * 10)
 
-                return installer_path
+                self._installer_foreground += 1
+                try:
+                    await self._stop_installer_prefetch()
+                    return await self._fetch_installer(progress_callback=log_progress)
+                finally:
+                    self._installer_foreground -= 1
+                    self._update_installer_prefetch()
 
             return get_cached() or await download()
 
@@ -269,8 +454,66 @@ class PoePlugin(Plugin):
         async def uninstall_game(self, game_id: str):
             self._exec(await self._get_installer(), arg=["/uninstall"])
 
+    async def _fetch_installer(self, **kwargs) -> str:
+        cached = await self._installer_cache.get(self._INSTALLER_BIN)
+        if cached and self._installer_prefetched:
+            # revalidated by the prefetch during this session already
+            return self._installer_cache.put(self._INSTALLER_BIN, cached)
+
+        try:
+            downloaded = await self._http_client.download_installer(
+                self._installer_cache.get_staging_path(self._INSTALLER_BIN), cached=cached, **kwargs
+            )
+        except (BackendError, BackendNotAvailable, BackendTimeout, NetworkError):
+            if cached is None:
+                raise
+            logger.warning("Failed to revalidate the cached installer, using it as is")
+            downloaded = cached
+
+        return self._installer_cache.put(self._INSTALLER_BIN, downloaded)
+
+    async def _prefetch_installer(self):
+        try:
+            await self._fetch_installer(bandwidth=self._INSTALLER_PREFETCH_BANDWIDTH)
+        except asyncio.CancelledError:
+            # the download is shielded from its callers, it has to be stopped explicitly
+            await self._http_client.cancel_download(self._installer_cache.get_staging_path(self._INSTALLER_BIN))
+            raise
+        except AuthenticationRequired:
+            return
+        except Exception:
+            logger.exception("Failed to prefetch the installer")
+            return
+
+        logger.info("Installer prefetched")
+        self._installer_prefetched = True
+
+    def _update_installer_prefetch(self):
+        # the prefetch only runs while nothing else needs the bandwidth: no game running, no foreground download
+        should_run = (
+            self._INSTALLER_PREFETCH
+            and self._authenticated
+            and not self._installer_prefetched
+            and not self._installer_foreground
+            and self._game_state == LocalGameState.None_
+        )
+        running = self._installer_prefetch is not None and not self._installer_prefetch.done()
+        if should_run and not running:
+            self._installer_prefetch = asyncio.create_task(self._prefetch_installer())
+        elif running and not should_run:
+            self._installer_prefetch.cancel()
+
+    async def _stop_installer_prefetch(self):
+        if self._installer_prefetch is None:
+            return
+
+        self._installer_prefetch.cancel()
+        await asyncio.wait([self._installer_prefetch])
+        self._installer_prefetch = None
+
     async def shutdown(self):
         await self._close_client()
+        self._achievements_catalog.close()
 
 
 def main():
@@ -0,0 +1,147 @@
+import os
+import sys
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, Iterable, Optional, Tuple
+
+from galaxy.proc_tools import get_process_info, pids, ProcessId
+
+if sys.platform == "win32":
+    from ctypes import byref, windll
+    from ctypes.wintypes import FILETIME
+
+    def get_create_time(pid: ProcessId) -> Optional[float]:
+        _PROC_QUERY_LIMITED_INFORMATION = 0x1000
+
+        h_process = windll.kernel32.OpenProcess(_PROC_QUERY_LIMITED_INFORMATION, False, pid)
+        if not h_process:
+            return None
+
+        try:
+            creation_time, exit_time, kernel_time, user_time = FILETIME(), FILETIME(), FILETIME(), FILETIME()
+            if not windll.kernel32.GetProcessTimes(
+                h_process, byref(creation_time), byref(exit_time), byref(kernel_time), byref(user_time)
+            ):
+                return None
+
+            return ((creation_time.dwHighDateTime << 32) | creation_time.dwLowDateTime) / 10 ** 7
+        finally:
+            windll.kernel32.CloseHandle(h_process)
+
+else:
+    import psutil
+
+    def get_create_time(pid: ProcessId) -> Optional[float]:
+        try:
+            return psutil.Process(pid).create_time()
+        except psutil.Error:
+            return None
+
+
+class ProcessSource:
+    def pids(self) -> Iterable[ProcessId]:
+        raise NotImplementedError()
+
+    def get_binary_path(self, pid: ProcessId) -> Optional[str]:
+        raise NotImplementedError()
+
+    def get_create_time(self, pid: ProcessId) -> Optional[float]:
+        raise NotImplementedError()
+
+
+class GalaxyProcessSource(ProcessSource):
+    def pids(self) -> Iterable[ProcessId]:
+        return pids()
+
+    def get_binary_path(self, pid: ProcessId) -> Optional[str]:
+        process_info = get_process_info(pid)
+        return process_info.binary_path if process_info else None
+
+    def get_create_time(self, pid: ProcessId) -> Optional[float]:
+        return get_create_time(pid)
+
+
+class FakeProcessSource(ProcessSource):
+    def __init__(self, processes: Optional[Dict[ProcessId, Optional[str]]] = None):
+        self.processes: Dict[ProcessId, Optional[str]] = dict(processes or {})
+        self.create_times: Dict[ProcessId, float] = {}
+        self.lookups = 0
+        self.create_time_lookups = 0
+
+    def pids(self) -> Iterable[ProcessId]:
+        return list(self.processes)
+
+    def get_binary_path(self, pid: ProcessId) -> Optional[str]:
+        self.lookups += 1
+        return self.processes.get(pid)
+
+    def get_create_time(self, pid: ProcessId) -> Optional[float]:
+        self.create_time_lookups += 1
+        return self.create_times.get(pid, 0.0) if pid in self.processes else None
+
+
+class ProcessScanner:
+    # known pids get their creation time re-checked a batch per scan, a reused pid is spotted within a few scans
+    _RECHECK_BATCH = 32
+    # scans to wait before inspecting a pid whose binary could not be read again, doubled up to the max
+    _UNKNOWN_RETRY_MAX = 64
+
+    def __init__(self, source: ProcessSource, binary_names: Iterable[str]):
+        self._source = source
+        self._suffixes = tuple(os.path.join(os.path.sep, binary_name.lower()) for binary_name in binary_names)
+        # pid -> create time, in the order of the last re-check
+        self._classified: "OrderedDict[ProcessId, Optional[float]]" = OrderedDict()
+        # pid -> (scan to inspect it on, backoff)
+        self._unknown: Dict[ProcessId, Tuple[int, int]] = {}
+        self._scan = 0
+        self._match: Optional[ProcessId] = None
+
+    def _is_game(self, binary_path: Optional[str]) -> bool:
+        return bool(self._suffixes) and binary_path is not None and binary_path.lower().endswith(self._suffixes)
+
+    def _classify(self, pid: ProcessId) -> bool:
+        binary_path = self._source.get_binary_path(pid)
+        if self._is_game(binary_path):
+            self._unknown.pop(pid, None)
+            self._match = pid
+            return True
+
+        if binary_path is None:
+            # access denied (or already gone), it may still turn out to be the game later on
+            _, backoff = self._unknown.get(pid, (0, 0))
+            backoff = min(backoff * 2 or 1, self._UNKNOWN_RETRY_MAX)
+            self._unknown[pid] = (self._scan + backoff, backoff)
+        else:
+            self._unknown.pop(pid, None)
+            self._classified[pid] = self._source.get_create_time(pid)
+        return False
+
+    def is_running(self) -> bool:
+        self._scan += 1
+        if self._match is not None:
+            if self._is_game(self._source.get_binary_path(self._match)):
+                return True
+            self._match = None
+
+        current = set(self._source.pids())
+        for pid in self._classified.keys() - current:
+            del self._classified[pid]
+        for pid in self._unknown.keys() - current:
+            del self._unknown[pid]
+
+        for pid in current:
+            if pid in self._classified or self._unknown.get(pid, (0, 0))[0] > self._scan:
+                continue
+            if self._classify(pid):
+                return True
+
+        for pid in list(islice(self._classified, self._RECHECK_BATCH)):
+            if self._source.get_create_time(pid) == self._classified[pid]:
+                self._classified.move_to_end(pid)
+                continue
+
+            del self._classified[pid]
+            if self._classify(pid):
+                return True
+
+        return False
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_RULES_HEADER = "X-Rate-Limit-Rules"
+_RULE_HEADER = "X-Rate-Limit-{rule}"
+_RULE_STATE_HEADER = "X-Rate-Limit-{rule}-State"
+_RETRY_AFTER_HEADER = "Retry-After"
+
+
+class _Window:
+    def __init__(self, hits: int, period: float):
+        self.hits = hits
+        self.period = period
+        self.requests: Deque[float] = deque()
+
+    def expire(self, now: float):
+        while self.requests and self.requests[0] <= now - self.period:
+            self.requests.popleft()
+
+    def get_delay(self, now: float) -> float:
+        self.expire(now)
+        if len(self.requests) < self.hits:
+            return 0
+        return self.requests[len(self.requests) - self.hits] + self.period - now
+
+
+def _parse_limits(value: Optional[str]) -> List[Tuple[int, int, int]]:
+    limits = []
+    for limit in (value or "").split(","):
+        try:
+            hits, period, penalty = (int(part) for part in limit.strip().split(":"))
+        except ValueError:
+            continue
+        limits.append((hits, period, penalty))
+
+    return limits
+
+
+class RateLimiter:
+    def __init__(self, margin: int = 1):
+        self._margin = margin
+        self._windows: Dict[Tuple[str, int], _Window] = {}
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    async def _wait(self, delay: float):
+        await asyncio.sleep(delay)
+
+    def get_delay(self) -> float:
+        now = self._now()
+        return max([self._blocked_until - now] + [window.get_delay(now) for window in self._windows.values()])
+
+    async def acquire(self):
+        async with self._lock:
+            delay = self.get_delay()
+            while delay > 0:
+                logger.debug("Rate limited, delaying the request by %.2fs", delay)
+                await self._wait(delay)
+                delay = self.get_delay()
+
+            now = self._now()
+            for window in self._windows.values():
+                window.requests.append(now)
+
+    def _block(self, seconds: float, now: float):
+        self._blocked_until = max(self._blocked_until, now + seconds)
+
+    def update(self, headers: Mapping[str, str]):
+        now = self._now()
+
+        retry_after = headers.get(_RETRY_AFTER_HEADER)
+        if retry_after and retry_after.strip().isdigit():
+            self._block(int(retry_after), now)
+
+        rules = [rule.strip() for rule in headers.get(_RULES_HEADER, "").split(",") if rule.strip()]
+        for rule in rules:
+            limits = _parse_limits(headers.get(_RULE_HEADER.format(rule=rule)))
+            states = _parse_limits(headers.get(_RULE_STATE_HEADER.format(rule=rule)))
+            seen_periods = set()
+            for index, (hits, period, _) in enumerate(limits):
+                seen_periods.add(period)
+                window = self._windows.get((rule, period))
+                if window is None:
+                    window = self._windows[(rule, period)] = _Window(hits, period)
+                window.hits = max(hits - self._margin, 1)
+
+                if index < len(states):
+                    current_hits, _, restricted = states[index]
+                    window.expire(now)
+                    # the server saw requests we did not (other clients, restarts); account for them as made just now
+                    window.requests.extend([now] * max(current_hits - len(window.requests), 0))
+                    if restricted:
+                        logger.warning("Rate limit %s:%d is restricted for %ds", rule, period, restricted)
+                        self._block(restricted, now)
+
+            for key in [key for key in self._windows if key[0] == rule and key[1] not in seen_periods]:
+                del self._windows[key]
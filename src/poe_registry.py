@@ -0,0 +1,159 @@
+import logging
+import platform
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+if platform.system() == "Windows":
+    import winreg
+
+logger = logging.getLogger(__name__)
+
+HKEY_CURRENT_USER = 0x80000001
+HKEY_LOCAL_MACHINE = 0x80000002
+
+UNINSTALL_KEY = r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"
+
+
+class RegistryKeyInfo(NamedTuple):
+    subkeys: int
+    values: int
+    last_write: int
+
+
+class RegistryBackend:
+    def query_info(self, hive: int, path: str) -> RegistryKeyInfo:
+        raise NotImplementedError()
+
+    def enum_keys(self, hive: int, path: str) -> List[str]:
+        raise NotImplementedError()
+
+    def query_values(self, hive: int, path: str, names: Iterable[str]) -> Dict[str, Any]:
+        raise NotImplementedError()
+
+
+class WinRegistryBackend(RegistryBackend):
+    def query_info(self, hive: int, path: str) -> RegistryKeyInfo:
+        with winreg.OpenKey(hive, path) as h_key:
+            return RegistryKeyInfo(*winreg.QueryInfoKey(h_key))
+
+    def enum_keys(self, hive: int, path: str) -> List[str]:
+        with winreg.OpenKey(hive, path) as h_key:
+            return [winreg.EnumKey(h_key, index) for index in range(winreg.QueryInfoKey(h_key)[0])]
+
+    def query_values(self, hive: int, path: str, names: Iterable[str]) -> Dict[str, Any]:
+        values = {}
+        with winreg.OpenKey(hive, path) as h_key:
+            for name in names:
+                try:
+                    values[name] = winreg.QueryValueEx(h_key, name)[0]
+                except FileNotFoundError:
+                    continue
+
+        return values
+
+
+class _FakeKey:
+    def __init__(self, name: str, last_write: int):
+        self.name = name
+        self.values: Dict[str, Any] = {}
+        self.subkeys: Dict[str, "_FakeKey"] = {}
+        self.last_write = last_write
+
+
+class FakeRegistryBackend(RegistryBackend):
+    def __init__(self):
+        self._hives: Dict[int, _FakeKey] = {}
+        self._clock = 0
+        self.queries = 0
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def _find(self, hive: int, path: str, create: bool = False) -> Tuple[Optional[_FakeKey], Optional[_FakeKey]]:
+        parent = None
+        key = self._hives.setdefault(hive, _FakeKey("", 0)) if create else self._hives.get(hive)
+        for name in filter(None, path.split("\\")):
+            if key is None:
+                break
+            parent = key
+            if create and name.lower() not in key.subkeys:
+                key.subkeys[name.lower()] = _FakeKey(name, self._tick())
+                key.last_write = self._clock
+            key = key.subkeys.get(name.lower())
+
+        return parent, key
+
+    def _get(self, hive: int, path: str) -> _FakeKey:
+        self.queries += 1
+        _, key = self._find(hive, path)
+        if key is None:
+            raise FileNotFoundError(path)
+        return key
+
+    def set_value(self, hive: int, path: str, name: str, value: Any):
+        _, key = self._find(hive, path, create=True)
+        key.values[name] = value
+        key.last_write = self._tick()
+
+    def delete_key(self, hive: int, path: str):
+        parent, key = self._find(hive, path)
+        if key is None or parent is None:
+            raise FileNotFoundError(path)
+        del parent.subkeys[key.name.lower()]
+        parent.last_write = self._tick()
+
+    def query_info(self, hive: int, path: str) -> RegistryKeyInfo:
+        key = self._get(hive, path)
+        return RegistryKeyInfo(len(key.subkeys), len(key.values), key.last_write)
+
+    def enum_keys(self, hive: int, path: str) -> List[str]:
+        return [subkey.name for subkey in self._get(hive, path).subkeys.values()]
+
+    def query_values(self, hive: int, path: str, names: Iterable[str]) -> Dict[str, Any]:
+        key = self._get(hive, path)
+        return {name: key.values[name] for name in names if name in key.values}
+
+
+class UninstallEntryIndex:
+    def __init__(
+        self
+        , backend: RegistryBackend
+        , display_name: str
+        , value_names: Iterable[str] = ()
+        , hive: int = HKEY_LOCAL_MACHINE
+        , path: str = UNINSTALL_KEY
+    ):
+        self._backend = backend
+        self._display_name = display_name
+        self._value_names = ("DisplayName", "Installed") + tuple(value_names)
+        self._hive = hive
+        self._path = path
+        self._last_write: Optional[int] = None
+        self._entry: Optional[Dict[str, Any]] = None
+
+    def _scan(self) -> Optional[Dict[str, Any]]:
+        for subkey in self._backend.enum_keys(self._hive, self._path):
+            try:
+                values = self._backend.query_values(self._hive, self._path + "\\" + subkey, self._value_names)
+            except (OSError, ValueError):
+                continue
+
+            if values.get("DisplayName") == self._display_name and values.get("Installed"):
+                return values
+
+        return None
+
+    def find(self, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        # the key's last write time only moves when entries are added or removed, not when an entry's values change:
+        # callers that find the cached values stale ask for a refresh
+        try:
+            last_write = self._backend.query_info(self._hive, self._path).last_write
+            if refresh or last_write != self._last_write:
+                self._entry = self._scan()
+                self._last_write = last_write
+        except (OSError, ValueError) as error:
+            logger.warning("Failed to look up %s in the registry: %r", self._display_name, error)
+            self._entry = None
+            self._last_write = None
+
+        return self._entry
@@ -0,0 +1,73 @@
+import logging
+import random
+import time
+from dataclasses import dataclass
+
+from galaxy.api.errors import BackendError, BackendNotAvailable, BackendTimeout, NetworkError
+
+logger = logging.getLogger(__name__)
+
+RETRIABLE_ERRORS = (BackendError, BackendNotAvailable, BackendTimeout, NetworkError)
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+class CircuitOpen(BackendNotAvailable):
+    pass
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8
+
+    def get_delay(self, attempt: int) -> float:
+        # "full jitter": spreads the retries of concurrent callers over the whole backoff window
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = self.CLOSED
+        self._trial_pending = False
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self._reset_timeout:
+            self._state = self.HALF_OPEN
+        return self._state
+
+    def check(self):
+        state = self.state
+        if state == self.OPEN or (state == self.HALF_OPEN and self._trial_pending):
+            raise CircuitOpen()
+        if state == self.HALF_OPEN:
+            # let a single trial request through, everyone else keeps failing fast until it reports back
+            self._trial_pending = True
+
+    def release(self):
+        self._trial_pending = False
+
+    def record_success(self):
+        if self._state != self.CLOSED:
+            logger.info("Backend recovered, closing the circuit")
+        self._failures = 0
+        self._state = self.CLOSED
+        self._trial_pending = False
+
+    def record_failure(self):
+        self._failures += 1
+        if self._state != self.CLOSED or self._failures >= self._failure_threshold:
+            if self._state == self.CLOSED:
+                logger.warning("%d consecutive backend failures, opening the circuit", self._failures)
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+        self._trial_pending = False
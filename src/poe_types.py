@@ -1,14 +1,31 @@
-from typing import List, NewType
+from typing import Callable, List, NamedTuple, NewType, Optional, Tuple
 
-from bs4.element import Tag
 from galaxy.api.types import Achievement
 
 PoeSessionId = NewType("PoeSessionId", str)
 ProfileName = NewType("ProfileName", str)
 Achievements = List[Achievement]
-HtmlPage = NewType("HtmlPage", str)
+HtmlPage = NewType("HtmlPage", bytes)
 
 Timestamp = NewType("Timestamp", int)
 AchievementName = NewType("AchievementName", str)
-AchievementTag = NewType("AchievementTag", Tag)
-AchievementTagSet = List[AchievementTag]
+AchievementId = NewType("AchievementId", int)
+AchievementProgress = NewType("AchievementProgress", Tuple[int, int])
+
+
+class AchievementRecord(NamedTuple):
+    name: AchievementName
+    progress: Optional[AchievementProgress]
+
+
+AchievementSet = Tuple[AchievementRecord, ...]
+AchievementsParser = Callable[[HtmlPage], AchievementSet]
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+class DownloadedFile(NamedTuple):
+    path: str
+    sha256: str
+    size: int
+    etag: Optional[str]
+    last_modified: Optional[str]
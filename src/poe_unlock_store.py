@@ -0,0 +1,84 @@
+import os
+import re
+from typing import Dict, Iterable, Iterator, Optional
+
+from poe_types import AchievementName, Timestamp
+
+# a record takes a single line, so the line breaks a name might hold are escaped
+_ESCAPES = {"\\": "\\\\", "\n": "\\n", "\r": "\\r"}
+_UNESCAPES = {escaped: character for character, escaped in _ESCAPES.items()}
+_ESCAPED = re.compile(r"\\.")
+
+
+def _escape(achievement_name: AchievementName) -> str:
+    return "".join(_ESCAPES.get(character, character) for character in achievement_name)
+
+
+def _unescape(text: str) -> AchievementName:
+    return AchievementName(_ESCAPED.sub(lambda match: _UNESCAPES.get(match.group(), match.group()), text))
+
+
+class UnlockTimeStore:
+    def __init__(self, path: str):
+        self._path = path
+        self._unlock_times: Optional[Dict[AchievementName, Timestamp]] = None
+        self._valid_size = 0
+
+    def _load(self) -> Dict[AchievementName, Timestamp]:
+        if self._unlock_times is not None:
+            return self._unlock_times
+
+        try:
+            with open(self._path, "rb") as store:
+                data = store.read()
+        except FileNotFoundError:
+            data = b""
+
+        # a record without the trailing new line is a torn write, it gets truncated on the next append
+        self._valid_size = data.rfind(b"\n") + 1
+        self._unlock_times = {}
+        for record in data[:self._valid_size].split(b"\n"):
+            try:
+                unlock_time, achievement_name = record.decode("utf-8").split("\t", maxsplit=1)
+                self._unlock_times.setdefault(_unescape(achievement_name), Timestamp(int(unlock_time)))
+            except ValueError:
+                continue
+
+        return self._unlock_times
+
+    def __contains__(self, achievement_name: AchievementName) -> bool:
+        return achievement_name in self._load()
+
+    def __iter__(self) -> Iterator[AchievementName]:
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def get(self, achievement_name: AchievementName) -> Optional[Timestamp]:
+        return self._load().get(achievement_name)
+
+    def record(self, achievement_names: Iterable[AchievementName], unlock_time: Timestamp):
+        unlock_times = self._load()
+        new_names = [
+            achievement_name
+            for achievement_name in dict.fromkeys(achievement_names)
+            if achievement_name not in unlock_times
+        ]
+        if not new_names:
+            return
+
+        records = "".join(
+            f"{unlock_time}\t{_escape(achievement_name)}\n" for achievement_name in new_names
+        ).encode("utf-8")
+
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        with open(self._path, "ab") as store:
+            if store.tell() != self._valid_size:
+                store.truncate(self._valid_size)
+            store.write(records)
+            store.flush()
+            os.fsync(store.fileno())
+
+        self._valid_size += len(records)
+        unlock_times.update((achievement_name, unlock_time) for achievement_name in new_names)
@@ -5,7 +5,7 @@ import platform
 from collections import namedtuple
 from shutil import copy, copytree, rmtree
 
-from invoke import task
+from invoke import call, task
 
 with open(os.path.join("src", "manifest.json"), "r") as manifest:
     _MANIFEST = json.load(manifest, object_hook=lambda d: namedtuple("MANIFEST", d.keys())(*d.values()))
@@ -24,6 +24,11 @@ _PLATFORM = {
     "Windows": "win32"
     , "Darwin": "macosx_10_12_x86_64"
 }[platform.system()]
+_ACHIEVEMENTS_INFO = "achievements.json"
+_ACHIEVEMENTS_IDS = "achievement_ids.json"
+_ACHIEVEMENTS_CATALOG = os.path.join("src", "achievements.cat")
+_BENCH_OUTPUT = "bench.json"
+_BENCH_BASELINE = os.path.join("benchmarks", "baseline.json")
 _REQ_DEV = "requirements/dev.txt"
 _REQ_RELEASE = "requirements/app.txt"
 _VERSION = _MANIFEST.version
@@ -39,7 +44,31 @@ def test(ctx):
     ctx.run("pytest")
 
 
-@task(test, aliases=["b"])
+@task(requirements, aliases=["bench"])
+def benchmark(ctx, output=_BENCH_OUTPUT, baseline=_BENCH_BASELINE, tolerance=0.25, repeat=5, save_baseline=False):
+    ctx.run(
+        "python -m benchmarks"
+        f" --output {output}"
+        f" --repeat {repeat}"
+        f" --baseline {baseline}"
+        f" --tolerance {tolerance}"
+        + (" --save-baseline" if save_baseline else "")
+        , echo=True
+    )
+
+
+@task(requirements)
+def scrape(ctx, info=_ACHIEVEMENTS_INFO, ids=_ACHIEVEMENTS_IDS):
+    ctx.run(f"python src/info_parser.py {info} --ids {ids}", echo=True)
+
+
+@task(aliases=["cat"])
+def catalog(ctx, ids=_ACHIEVEMENTS_IDS, output=_ACHIEVEMENTS_CATALOG):
+    ctx.run(f"python src/poe_catalog.py {ids} {output}", echo=True)
+
+
+# the gated metrics come from a single measured run, the repeats only steady the reported wall times
+@task(test, call(benchmark, repeat=1), catalog, aliases=["b"])
 def build(ctx, output_dir=_OUTPUT_DIR):
     if os.path.exists(output_dir):
         rmtree(output_dir)
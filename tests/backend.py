@@ -0,0 +1,123 @@
+import asyncio
+import re
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import hdrs, web
+from aiohttp.test_utils import TestServer
+
+from tests.pages import generate_page
+
+_CHUNK_SIZE = 16 * 1024
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+class PoeBackend:
+    def __init__(self, poesessid: str, profile_name: str):
+        self.poesessid = poesessid
+        self.profile_name = profile_name
+        self.latency = 0.0
+        self.bandwidth: Optional[int] = None
+        self.errors: List[Tuple[int, Dict[str, str]]] = []
+        self.rate_limit_headers: Dict[str, str] = {}
+        self.requests: List[Tuple[str, str]] = []
+        self.installer = bytes(range(256)) * 1024
+        self.installer_etag = '"installer-1"'
+        self.installer_ranges: List[str] = []
+        self.accept_ranges = True
+        self.achievements_page, self.completed_achievements = generate_page(10)
+
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/account/view-profile/{profile_name}/achievements", self._get_achievements)
+        app.router.add_get("/downloads/PathOfExileInstaller.exe", self._get_installer)
+        app.router.add_route(hdrs.METH_HEAD, "/", self._get_index)
+        app.router.add_get("/login", self._get_index)
+        self._server = TestServer(app)
+
+    @property
+    def base_url(self) -> str:
+        return str(self._server.make_url("")).rstrip("/")
+
+    def inject_error(self, status: int, headers: Optional[Dict[str, str]] = None):
+        self.errors.append((status, headers or {}))
+
+    def set_page_size(self, achievements: int, completed_ratio: float = 0.6):
+        self.achievements_page, self.completed_achievements = generate_page(achievements, completed_ratio)
+
+    async def start(self):
+        await self._server.start_server()
+
+    async def close(self):
+        await self._server.close()
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.requests.append((request.method, request.path))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self.errors:
+            status, headers = self.errors.pop(0)
+            response = web.Response(status=status, headers=headers)
+        else:
+            response = await handler(request)
+
+        if not response.prepared:
+            response.headers.update(self.rate_limit_headers)
+        return response
+
+    async def _get_index(self, request: web.Request) -> web.Response:
+        return web.Response()
+
+    async def _get_achievements(self, request: web.Request) -> web.StreamResponse:
+        if (
+            request.cookies.get("POESESSID") != self.poesessid
+            or request.match_info["profile_name"] != self.profile_name
+        ):
+            raise web.HTTPFound("/login")
+
+        return await self._send(request, self.achievements_page, content_type="text/html")
+
+    async def _get_installer(self, request: web.Request) -> web.StreamResponse:
+        headers = {hdrs.ETAG: self.installer_etag}
+        if self.accept_ranges:
+            headers[hdrs.ACCEPT_RANGES] = "bytes"
+        if request.headers.get(hdrs.IF_NONE_MATCH) == self.installer_etag:
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        body = self.installer
+        status = HTTPStatus.OK
+
+        range_match = _RANGE.match(request.headers.get(hdrs.RANGE, ""))
+        if range_match:
+            self.installer_ranges.append(request.headers[hdrs.RANGE])
+        if self.accept_ranges and range_match and any(range_match.groups()):
+            first, last = range_match.groups()
+            if not first:
+                first, last = len(body) - int(last), len(body) - 1
+            first, last = int(first), min(int(last) if last else len(body) - 1, len(body) - 1)
+            if first > last:
+                raise web.HTTPRequestRangeNotSatisfiable(headers={hdrs.CONTENT_RANGE: f"bytes */{len(body)}"})
+
+            status = HTTPStatus.PARTIAL_CONTENT
+            headers[hdrs.CONTENT_RANGE] = f"bytes {first}-{last}/{len(body)}"
+            body = body[first:last + 1]
+
+        return await self._send(request, body, status=status, headers=headers)
+
+    async def _send(self, request: web.Request, body: bytes, status: int = HTTPStatus.OK, **kwargs):
+        if not self.bandwidth:
+            return web.Response(body=body, status=status, **kwargs)
+
+        response = web.StreamResponse(status=status, headers=kwargs.get("headers"))
+        response.headers.update(self.rate_limit_headers)
+        if "content_type" in kwargs:
+            response.content_type = kwargs["content_type"]
+        response.content_length = len(body)
+        await response.prepare(request)
+        for offset in range(0, len(body), _CHUNK_SIZE):
+            chunk = body[offset:offset + _CHUNK_SIZE]
+            await response.write(chunk)
+            await asyncio.sleep(len(chunk) / self.bandwidth)
+        await response.write_eof()
+        return response
@@ -1,11 +1,13 @@
 import asyncio
 import platform
+import time
 from unittest.mock import ANY, MagicMock
 
 import pytest
 
 from poe_plugin import PoeHttpClient, PoePlugin
 from poe_types import PoeSessionId, ProfileName
+from tests.backend import PoeBackend
 from tests.utils import AsyncMock
 
 
@@ -22,6 +24,11 @@ def manifest_mock(mocker):
     return mocker.patch("poe_plugin.PoePlugin._read_manifest")
 
 
+@pytest.fixture()
+def data_dir_mock(mocker, tmp_path):
+    return mocker.patch("poe_plugin.PoePlugin._get_data_dir", return_value=str(tmp_path))
+
+
 @pytest.fixture()
 def game_id():
     return PoePlugin._GAME_ID
@@ -51,12 +58,47 @@ def http_client_mock(mocker):
 async def mock_http_client(http_client_mock, poesessid, profile_name) -> PoeHttpClient:
     http_client = http_client_mock.return_value
     http_client.shutdown = AsyncMock()
+    http_client.get_achievements = AsyncMock(return_value=())
+    http_client.get_achievements_refreshed_at = MagicMock(side_effect=lambda: time.time())
+    http_client.update_credentials = AsyncMock()
     yield http_client
 
-    http_client_mock.assert_called_once_with(poesessid, profile_name, ANY)
+    http_client_mock.assert_called_once_with(
+        poesessid
+        , profile_name
+        , ANY
+        , parser=PoePlugin._ACHIEVEMENTS_PARSER
+        , parse_processes=PoePlugin._ACHIEVEMENTS_PARSE_PROCESSES
+        , parse_time_budget=PoePlugin._ACHIEVEMENTS_PARSE_TIME_BUDGET
+        , connector_options=PoePlugin._HTTP_CONNECTOR_OPTIONS
+    )
     http_client.shutdown.assert_called_once_with()
 
 
+@pytest.fixture()
+async def poe_backend(poesessid, profile_name) -> PoeBackend:
+    backend = PoeBackend(poesessid, profile_name)
+    await backend.start()
+    yield backend
+    await backend.close()
+
+
+@pytest.fixture()
+async def backend_http_client_factory(poe_backend, poesessid, profile_name):
+    http_clients = []
+
+    def create_http_client(poesessid=poesessid, profile_name=profile_name, **kwargs) -> PoeHttpClient:
+        http_clients.append(
+            PoeHttpClient(poesessid, profile_name, MagicMock(), base_url=poe_backend.base_url, **kwargs)
+        )
+        return http_clients[-1]
+
+    yield create_http_client
+
+    for http_client in http_clients:
+        await http_client.shutdown()
+
+
 @pytest.fixture()
 def reg_query_value_mock(mocker):
     if not is_windows():
@@ -65,7 +107,8 @@ def reg_query_value_mock(mocker):
     return mocker.patch("poe_plugin.winreg.QueryValueEx")
 
 @pytest.fixture()
-def poe_plugin_mock(manifest_mock, reg_query_value_mock, mocker) -> PoePlugin:
+def poe_plugin_mock(manifest_mock, data_dir_mock, reg_query_value_mock, mocker) -> PoePlugin:
+    mocker.patch.object(PoePlugin, "_ACHIEVEMENTS_PREFETCH", False)
     if is_windows():
         mocker.patch("poe_plugin.winreg.OpenKey")
         reg_query_value_mock.return_value = (None, winreg.REG_SZ)
@@ -0,0 +1,72 @@
+import random
+from typing import List, Tuple
+
+_NOISE = (
+    '<div class="navigation"><ul>{items}</ul></div>'
+    , '<script type="text/javascript">window.PoE = {{"token": "{token}", "ts": {ts}}};</script>'
+    , '<!-- generated in {ts}ms by {token} -->'
+    , '<div class="advert" data-slot="{token}"><img src="https://web.poecdn.com/ad/{token}.png"/></div>'
+)
+
+
+def _noise(rng: random.Random) -> str:
+    return rng.choice(_NOISE).format(
+        items="".join(f'<li><a href="/forum/{rng.randrange(10 ** 6)}">Forum</a></li>' for _ in range(5))
+        , token="%032x" % rng.getrandbits(128)
+        , ts=rng.randrange(10 ** 6)
+    )
+
+
+def _completed(name: str) -> str:
+    return (
+        f'<div class="achievement clearfix"><a class="btn-detail"></a>'
+        f'<h2>{name}</h2>'
+        f'<div class="detail"><span class="text">Description of {name}.</span></div>'
+        f'<img class="completion" src="https://web.poecdn.com/image/Art/2DArt/UIImages/InGame/Tick.png"/>'
+        f'</div>'
+    )
+
+
+def _incomplete(name: str, rng: random.Random) -> str:
+    total = rng.randrange(2, 16)
+    done = rng.randrange(total)
+    return (
+        f'<div class="achievement clearfix incomplete"><a class="btn-detail"></a>'
+        f'<h2>{name}</h2>'
+        f'<h2 class="completion-detail"><span class="completion-incomplete">{done}</span>/{total}</h2>'
+        f'<div class="detail"><span class="text">Description of {name}.</span><br/><br/>'
+        f'<span class="items"><ul class="split">'
+        + "".join(
+            f'<li class="{"finished" if idx < done else ""}">{name} part {idx}</li>' for idx in range(total)
+        )
+        + '</ul></span></div>'
+        '<img class="completion" src="https://web.poecdn.com/image/Art/2DArt/UIImages/InGame/Cross.png"/>'
+        '</div>'
+    )
+
+
+def generate_page(achievements: int, completed_ratio: float = 0.6, seed: int = 0) -> Tuple[bytes, List[str]]:
+    rng = random.Random(seed)
+    completed_names = []
+    entries = []
+    for idx in range(achievements):
+        name = f"Achievement {idx} of the Atlas"
+        if rng.random() < completed_ratio:
+            completed_names.append(name)
+            entries.append(_completed(name))
+        else:
+            entries.append(_incomplete(name, rng))
+
+        if rng.random() < 0.05:
+            entries.append(_noise(rng))
+
+    page = (
+        '<html><head><title>Achievements</title>'
+        + "".join(_noise(rng) for _ in range(20))
+        + '</head><body>'
+        + "".join(_noise(rng) for _ in range(20))
+        + '<div class="achievement-list">' + "".join(entries) + '</div>'
+        + "".join(_noise(rng) for _ in range(20))
+        + '</body></html>'
+    )
+    return page.encode("utf-8"), completed_names
@@ -1,11 +1,16 @@
-from datetime import datetime
+import asyncio
+import time
 
 import pytest
-from bs4 import BeautifulSoup
 from galaxy.api.errors import UnknownBackendResponse
 from galaxy.api.types import Achievement
 
-from tests.utils import AsyncMock, MagicMock
+from poe_http_client import PoeHttpClient
+from poe_parsers import ACHIEVEMENTS_PARSERS, parse_achievements_lxml
+from poe_retry import CircuitOpen
+from poe_types import AchievementName, AchievementProgress, AchievementRecord
+
+from tests.utils import AsyncMock, MagicMock, response_mock
 
 _ACHIEVEMENTS_PAGE = '''
 <html>
@@ -98,68 +103,28 @@ _ACHIEVEMENTS_PAGE = '''
     </body>
 </html>
 '''
-_UNLOCKED_ACHIEVEMENTS_TAGS = [
-    BeautifulSoup(tag, "lxml").div for tag in (
-        '''<div class="achievement clearfix"><a class="btn-detail"></a>
-            <h2>Shaper of Worlds</h2>
-            <div class="detail">
-                <span class="text">Defeat the Shaper.</span>
-            </div>
-            <img class="completion" src="https://web.poecdn.com/image/Art/2DArt/UIImages/InGame/Tick.png"/>
-        </div>'''
-        , '''<div class="achievement clearfix"><a class="btn-detail"></a>
-            <h2>New World Order</h2>
-            <div class="detail">
-                <span class="text">Upgrade a map with a Shaper's Orb.</span>
-            </div>
-            <img class="completion" src="https://web.poecdn.com/image/Art/2DArt/UIImages/InGame/Tick.png?hash=1f20be360c2bcbcdafcd6a783ed7a944"/>
-        </div>'''
-        , '''<div class="achievement clearfix"><a class="btn-detail"></a>
-            <h2>Sacrifice of the Vaal</h2>
-            <div class="detail">
-                <span class="text">Kill Atziri in the Alluring Abyss.</span>
-            </div>
-            <img class="completion" src="https://web.poecdn.com/image/Art/2DArt/UIImages/InGame/Tick.png?hash=1f20be360c2bcbcdafcd6a783ed7a944"/>
-        </div>'''
-        , '''<div class="achievement clearfix"><a class="btn-detail"></a>
-            <h2>Unforgettable</h2>
-            <h2 class="completion-detail"><span class="">15</span>/15</h2>
-            <div class="detail">
-            <span class="text">Obtain the Shaper's Memory Fragments I through XV.</span><br/><br/>
-            <span class="items">
-                <ul class="split">
-                    <li class="finished">Memory Fragment I</li>
-                    <li class="finished">Memory Fragment II</li>
-                    <li class="finished">Memory Fragment III</li>
-                    <li class="finished">Memory Fragment IV</li>
-                    <li class="finished">Memory Fragment V</li>
-                    <li class="finished">Memory Fragment VI</li>
-                    <li class="finished">Memory Fragment VII</li>
-                    <li class="finished">Memory Fragment VIII</li>
-                </ul>
-                <ul class="split">
-                    <li class="finished">Memory Fragment IX</li>
-                    <li class="finished">Memory Fragment X</li>
-                    <li class="finished">Memory Fragment XI</li>
-                    <li class="finished">Memory Fragment XII</li>
-                    <li class="finished">Memory Fragment XIII</li>
-                    <li class="finished">Memory Fragment XIV</li>
-                    <li class="finished">Memory Fragment XV</li>
-                </ul>
-            </span>
-            </div>
-            <img class="completion" src="https://web.poecdn.com/image/Art/2DArt/UIImages/InGame/Tick.png?hash=1f20be360c2bcbcdafcd6a783ed7a944"/>
-        </div>'''
-        , '''<div class="achievement clearfix"><a class="btn-detail"></a>
-            <h2>Augmentation</h2>
-            <div class="detail">
-                <span class="text">Use an orb to change the mods of a Strongbox.</span>
-            </div>
-            <img class="completion" src="https://web.poecdn.com/image/Art/2DArt/UIImages/InGame/Tick.png?hash=1f20be360c2bcbcdafcd6a783ed7a944"/>
-        </div>'''
-    )
+_UNLOCKED_ACHIEVEMENTS_SET = (
+    AchievementRecord(AchievementName("Shaper of Worlds"), None)
+    , AchievementRecord(AchievementName("New World Order"), None)
+    , AchievementRecord(AchievementName("Sacrifice of the Vaal"), None)
+    , AchievementRecord(AchievementName("Unforgettable"), AchievementProgress((15, 15)))
+    , AchievementRecord(AchievementName("Augmentation"), None)
+)
+_BROKEN_ACHIEVEMENTS_PAGES = [
+    '''<div class="achievement-list"><div class="achievement clearfix"><a class="btn-detail"></a>
+        <h2></h2>
+        <div class="detail">
+            <span class="text">Defeat the Shaper.</span>
+        </div>
+        <img class="completion" src="https://web.poecdn.com/image/Art/2DArt/UIImages/InGame/Tick.png"/>
+    </div></div>'''
+    , '''<div class="achievement-list"><div class="achievement clearfix"><a class="btn-detail"></a>
+        <div class="detail">
+            <span class="text">Defeat the Shaper.</span>
+        </div>
+        <img class="completion" src="https://web.poecdn.com/image/Art/2DArt/UIImages/InGame/Tick.png"/>
+    </div></div>'''
 ]
-_UNLOCK_DATE = datetime(year=2019, month=2, day=7)
 _UNLOCK_TIMESTAMP = 1549494000
 _UNLOCKED_ACHIEVEMENTS = [
     Achievement(_UNLOCK_TIMESTAMP, achievement_name=name)
@@ -168,83 +133,439 @@ _UNLOCKED_ACHIEVEMENTS = [
 
 
 @pytest.fixture()
-def get_page_mock(mocker):
-    return mocker.patch("poe_plugin.PoeHttpClient._get_page", new_callable=AsyncMock)
+def authenticated_request_mock(mocker):
+    return mocker.patch("poe_plugin.PoeHttpClient._authenticated_request", new_callable=AsyncMock)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend_response, achievements", [
+    ("", ())
+    , ("<div class=\"achievement-list\"></div>", ())
+    , (_ACHIEVEMENTS_PAGE, _UNLOCKED_ACHIEVEMENTS_SET)
+])
+async def test_get_achievements(
+    backend_response
+    , achievements
+    , authenticated_request_mock
+    , auth_poe_plugin
+    , game_id
+    , time_mock
+):
+    authenticated_request_mock.return_value = response_mock(backend_response.encode("utf-8"))
+
+    assert await auth_poe_plugin.prepare_achievements_context([game_id]) == achievements
 
 
 @pytest.fixture()
-def date_time_mock(mocker):
-    dt_mock = mocker.patch("poe_plugin.datetime")
-    dt_mock.utcnow = MagicMock(return_value=_UNLOCK_DATE)
-    return dt_mock
+def parser_mock(mocker):
+    parser = MagicMock(wraps=parse_achievements_lxml)
+    mocker.patch.dict(ACHIEVEMENTS_PARSERS, {"lxml": parser})
+    return parser
+
+
+@pytest.mark.asyncio
+async def test_get_achievements_not_modified(
+    authenticated_request_mock
+    , parser_mock
+    , auth_poe_plugin
+):
+    authenticated_request_mock.return_value = response_mock(
+        _ACHIEVEMENTS_PAGE.encode("utf-8")
+        , headers={"ETag": "\"etag\"", "Last-Modified": "Thu, 07 Feb 2019 00:00:00 GMT"}
+    )
+    assert await auth_poe_plugin._http_client.get_achievements() == _UNLOCKED_ACHIEVEMENTS_SET
+
+    authenticated_request_mock.return_value = response_mock(status=304)
+    assert await auth_poe_plugin._http_client.get_achievements() == _UNLOCKED_ACHIEVEMENTS_SET
+
+    assert authenticated_request_mock.call_args[1]["headers"] == {
+        "If-None-Match": "\"etag\"", "If-Modified-Since": "Thu, 07 Feb 2019 00:00:00 GMT"
+    }
+    authenticated_request_mock.return_value.release.assert_called_once_with()
+    parser_mock.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_achievements_same_digest(
+    authenticated_request_mock
+    , parser_mock
+    , auth_poe_plugin
+):
+    authenticated_request_mock.return_value = response_mock(_ACHIEVEMENTS_PAGE.encode("utf-8"))
+    assert await auth_poe_plugin._http_client.get_achievements() == _UNLOCKED_ACHIEVEMENTS_SET
+
+    authenticated_request_mock.return_value = response_mock(
+        _ACHIEVEMENTS_PAGE.replace("<html>", "<html><!-- csrf token -->").encode("utf-8")
+    )
+    assert await auth_poe_plugin._http_client.get_achievements() == _UNLOCKED_ACHIEVEMENTS_SET
+
+    footer = '<div class="footer"><div>rendered in 12ms</div></div>'
+    authenticated_request_mock.return_value = response_mock(
+        _ACHIEVEMENTS_PAGE.replace("</body>", footer + "</body>").encode("utf-8")
+    )
+    assert await auth_poe_plugin._http_client.get_achievements() == _UNLOCKED_ACHIEVEMENTS_SET
+
+    assert authenticated_request_mock.call_args[1]["headers"] == {}
+    parser_mock.assert_called_once()
+
+    authenticated_request_mock.return_value = response_mock(
+        _ACHIEVEMENTS_PAGE.replace("Shaper of Worlds", "Shaper of Realms").encode("utf-8")
+    )
+    assert await auth_poe_plugin._http_client.get_achievements() != _UNLOCKED_ACHIEVEMENTS_SET
+    assert parser_mock.call_count == 2
 
 
 @pytest.mark.asyncio
-@pytest.mark.parametrize("backend_response, achievement_tags", [
+@pytest.mark.parametrize("backend_response, achievements", [
     ("", [])
     , ("<div class=\"achievement-list\"></div>", [])
-    , (_ACHIEVEMENTS_PAGE, _UNLOCKED_ACHIEVEMENTS_TAGS)
+    , (_ACHIEVEMENTS_PAGE, list(_UNLOCKED_ACHIEVEMENTS_SET))
 ])
-async def test_get_achievements_tags(
+@pytest.mark.parametrize("chunk_size", [7, 1024, 64 * 1024])
+async def test_stream_achievements(
     backend_response
-    , achievement_tags
-    , get_page_mock
+    , achievements
+    , chunk_size
+    , authenticated_request_mock
+    , auth_poe_plugin
+):
+    authenticated_request_mock.return_value = response_mock(backend_response.encode("utf-8"), chunk_size)
+
+    assert [
+        achievement async for achievement in auth_poe_plugin._http_client.stream_achievements()
+    ] == achievements
+
+
+@pytest.mark.asyncio
+async def test_stream_achievements_stops_after_list(
+    authenticated_request_mock
+    , auth_poe_plugin
+):
+    response = response_mock((
+        '<div class="achievement-list"><div class="achievement"><h2>Shaper of Worlds</h2></div></div>'
+        + '<div class="achievement"><h2>Not an achievement</h2></div>' * 100
+    ).encode("utf-8"), 64)
+    authenticated_request_mock.return_value = response
+
+    assert [
+        achievement async for achievement in auth_poe_plugin._http_client.stream_achievements()
+    ] == [AchievementRecord(AchievementName("Shaper of Worlds"), None)]
+    response.close.assert_called_once_with()
+    response.release.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stream_achievements_failure(
+    authenticated_request_mock
     , auth_poe_plugin
-    , game_id
-    , date_time_mock
 ):
-    get_page_mock.return_value = backend_response
+    authenticated_request_mock.return_value = response_mock(
+        b'<div class="achievement-list"><div class="achievement"><h2></h2></div></div>'
+    )
 
-    assert await auth_poe_plugin.prepare_achievements_context([game_id]) == achievement_tags
+    with pytest.raises(UnknownBackendResponse):
+        assert [
+            achievement async for achievement in auth_poe_plugin._http_client.stream_achievements()
+        ]
 
 
 @pytest.mark.asyncio
-@pytest.mark.parametrize("achievements_tags, achievements, cached_achievement", [
-    ([], [], None)
-    , (_UNLOCKED_ACHIEVEMENTS_TAGS, _UNLOCKED_ACHIEVEMENTS, Achievement(1548111600, achievement_name="Augmentation"))
-    , (_UNLOCKED_ACHIEVEMENTS_TAGS, _UNLOCKED_ACHIEVEMENTS, Achievement(_UNLOCK_DATE, achievement_name="Augmentation"))
+@pytest.mark.parametrize("achievements_set, achievements, cached_achievement", [
+    ((), [], None)
+    , (_UNLOCKED_ACHIEVEMENTS_SET, _UNLOCKED_ACHIEVEMENTS, Achievement(1548111600, achievement_name="Augmentation"))
+    , (
+        _UNLOCKED_ACHIEVEMENTS_SET
+        , _UNLOCKED_ACHIEVEMENTS
+        , Achievement(_UNLOCK_TIMESTAMP, achievement_name="Augmentation")
+    )
 ])
 async def test_import_achievements_success(
-    achievements_tags
+    achievements_set
     , achievements
     , cached_achievement
     , auth_poe_plugin
     , game_id
-    , date_time_mock
+    , time_mock
 ):
     unlocked_achievements = achievements[:]
 
     if cached_achievement is not None:
-        auth_poe_plugin._achievements_cache[cached_achievement.achievement_name] = cached_achievement.unlock_time
+        auth_poe_plugin._achievements_store.record(
+            [cached_achievement.achievement_name], cached_achievement.unlock_time
+        )
         unlocked_achievements.append(cached_achievement)
 
     assert await auth_poe_plugin.get_unlocked_achievements(
-        game_id, achievements_tags
+        game_id, achievements_set
     ) == unlocked_achievements
 
 
 @pytest.mark.asyncio
-@pytest.mark.parametrize("achievement_tag", [
-    BeautifulSoup(tag, "lxml").div for tag in (
-        '''<div class="achievement clearfix"><a class="btn-detail"></a>
-            <h2></h2>
-            <div class="detail">
-                <span class="text">Defeat the Shaper.</span>
-            </div>
-            <img class="completion" src="https://web.poecdn.com/image/Art/2DArt/UIImages/InGame/Tick.png"/>
-        </div>'''
-        , '''<div class="achievement clearfix"><a class="btn-detail"></a>
-            <div class="detail">
-                <span class="text">Defeat the Shaper.</span>
-            </div>
-            <img class="completion" src="https://web.poecdn.com/image/Art/2DArt/UIImages/InGame/Tick.png"/>
-        </div>'''
-    )])
-async def test_import_achievements_failure(
-    achievement_tag
+@pytest.mark.parametrize("backend_response", _BROKEN_ACHIEVEMENTS_PAGES)
+async def test_get_achievements_failure(
+    backend_response
+    , authenticated_request_mock
     , auth_poe_plugin
     , game_id
-    , date_time_mock
 ):
+    authenticated_request_mock.return_value = response_mock(backend_response.encode("utf-8"))
+
     with pytest.raises(UnknownBackendResponse):
-        assert await auth_poe_plugin.get_unlocked_achievements(game_id, [achievement_tag])
+        assert await auth_poe_plugin.prepare_achievements_context([game_id])
+
+
+@pytest.mark.asyncio
+async def test_get_achievements_over_time_budget(
+    authenticated_request_mock
+    , auth_poe_plugin
+    , game_id
+    , caplog
+):
+    auth_poe_plugin._http_client._parse_time_budget = 0
+    authenticated_request_mock.return_value = response_mock(_ACHIEVEMENTS_PAGE.encode("utf-8"))
+
+    assert await auth_poe_plugin.prepare_achievements_context([game_id]) == _UNLOCKED_ACHIEVEMENTS_SET
+    assert "over the 0.000s budget" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_get_achievements_process_pool(
+    poesessid
+    , profile_name
+    , authenticated_request_mock
+):
+    http_client = PoeHttpClient(poesessid, profile_name, MagicMock(), parse_processes=1)
+    authenticated_request_mock.return_value = response_mock(_ACHIEVEMENTS_PAGE.encode("utf-8"))
+
+    try:
+        assert await http_client.get_achievements() == _UNLOCKED_ACHIEVEMENTS_SET
+    finally:
+        await http_client.shutdown()
+
+
+@pytest.fixture()
+def get_achievements_mock(mocker):
+    mocker.patch("poe_plugin.PoeHttpClient.get_achievements_refreshed_at", side_effect=lambda: time.time())
+    return mocker.patch("poe_plugin.PoeHttpClient.get_achievements", new_callable=AsyncMock)
+
+
+@pytest.fixture()
+def unlock_achievement_mock(mocker):
+    return mocker.patch("poe_plugin.PoePlugin.unlock_achievement")
+
+
+@pytest.mark.asyncio
+async def test_refresh_achievements_pushes_new_only(
+    get_achievements_mock
+    , unlock_achievement_mock
+    , auth_poe_plugin
+    , game_id
+    , time_mock
+):
+    get_achievements_mock.return_value = _UNLOCKED_ACHIEVEMENTS_SET[:-1]
+    assert await auth_poe_plugin._refresh_achievements() == len(_UNLOCKED_ACHIEVEMENTS)
+
+    unlock_achievement_mock.reset_mock()
+    get_achievements_mock.return_value = _UNLOCKED_ACHIEVEMENTS_SET
+    assert await auth_poe_plugin._refresh_achievements() == 1
+    unlock_achievement_mock.assert_called_once_with(
+        game_id, Achievement(_UNLOCK_TIMESTAMP, achievement_name="Augmentation")
+    )
+
+    unlock_achievement_mock.reset_mock()
+    assert await auth_poe_plugin._refresh_achievements() == 0
+    unlock_achievement_mock.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_poll_achievements(
+    get_achievements_mock
+    , unlock_achievement_mock
+    , poe_plugin
+    , stored_credentials
+    , game_id
+    , time_mock
+):
+    poe_plugin._ACHIEVEMENTS_POLL = True
+    poe_plugin._ACHIEVEMENTS_POLL_INTERVAL_IDLE = 0.01
+    get_achievements_mock.return_value = _UNLOCKED_ACHIEVEMENTS_SET
+
+    await poe_plugin.authenticate(stored_credentials)
+    await asyncio.sleep(0.05)
+
+    assert unlock_achievement_mock.call_count == len(_UNLOCKED_ACHIEVEMENTS) + 1
+    assert get_achievements_mock.call_count >= 2
+    assert not poe_plugin._achievements_poller.done()
+
+
+@pytest.mark.asyncio
+async def test_get_achievements_single_flight(
+    auth_poe_plugin
+    , game_id
+    , mocker
+):
+    response_ready = asyncio.Event()
+
+    async def delayed_response(*args, **kwargs):
+        await response_ready.wait()
+        return response_mock(_ACHIEVEMENTS_PAGE.encode("utf-8"))
+
+    authenticated_request_mock = mocker.patch(
+        "poe_plugin.PoeHttpClient._authenticated_request", side_effect=delayed_response
+    )
+
+    cancelled_context = asyncio.ensure_future(auth_poe_plugin.prepare_achievements_context([game_id]))
+    contexts = asyncio.gather(*(auth_poe_plugin.prepare_achievements_context([game_id]) for _ in range(3)))
+    await asyncio.sleep(0)
+    cancelled_context.cancel()
+    response_ready.set()
+
+    assert await contexts == [_UNLOCKED_ACHIEVEMENTS_SET] * 3
+    assert cancelled_context.cancelled()
+    authenticated_request_mock.assert_called_once()
+
+    await auth_poe_plugin._http_client.get_achievements()
+    assert authenticated_request_mock.call_count == 2
+
+
+@pytest.fixture()
+def time_mock(mocker):
+    return mocker.patch("poe_plugin.time.time", return_value=_UNLOCK_TIMESTAMP)
+
+
+@pytest.mark.asyncio
+async def test_achievements_served_from_snapshot(
+    get_achievements_mock
+    , unlock_achievement_mock
+    , time_mock
+    , auth_poe_plugin
+    , game_id
+):
+    get_achievements_mock.return_value = _UNLOCKED_ACHIEVEMENTS_SET[:-1]
+    context = await auth_poe_plugin.prepare_achievements_context([game_id])
+    assert context == _UNLOCKED_ACHIEVEMENTS_SET[:-1]
+    await auth_poe_plugin.get_unlocked_achievements(game_id, context)
+    assert auth_poe_plugin.persistent_cache == {
+        "achievements_refreshed_at/profile_name": str(_UNLOCK_TIMESTAMP)
+    }
+
+    time_mock.return_value += auth_poe_plugin._ACHIEVEMENTS_CACHE_TTL
+    get_achievements_mock.return_value = _UNLOCKED_ACHIEVEMENTS_SET
+    assert await auth_poe_plugin.prepare_achievements_context([game_id]) == _UNLOCKED_ACHIEVEMENTS_SET[:-1]
+    get_achievements_mock.assert_called_once_with()
+
+    time_mock.return_value += 1
+    assert await auth_poe_plugin.prepare_achievements_context([game_id]) == _UNLOCKED_ACHIEVEMENTS_SET[:-1]
+    await auth_poe_plugin._achievements_revalidation
+
+    assert get_achievements_mock.call_count == 2
+    unlock_achievement_mock.assert_called_once_with(
+        game_id, Achievement(time_mock.return_value, achievement_name="Augmentation")
+    )
+    assert await auth_poe_plugin.prepare_achievements_context([game_id]) == _UNLOCKED_ACHIEVEMENTS_SET
+
+
+@pytest.mark.asyncio
+async def test_achievements_served_from_persisted_snapshot(
+    get_achievements_mock
+    , time_mock
+    , auth_poe_plugin
+    , game_id
+):
+    auth_poe_plugin._achievements_store.record(["Shaper of Worlds", "Augmentation"], _UNLOCK_TIMESTAMP)
+    auth_poe_plugin.persistent_cache["achievements_refreshed_at/profile_name"] = str(_UNLOCK_TIMESTAMP)
+
+    assert await auth_poe_plugin.prepare_achievements_context([game_id]) == (
+        AchievementRecord(AchievementName("Shaper of Worlds"), None)
+        , AchievementRecord(AchievementName("Augmentation"), None)
+    )
+    get_achievements_mock.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_achievements_snapshot_too_stale(
+    get_achievements_mock
+    , time_mock
+    , auth_poe_plugin
+    , game_id
+):
+    auth_poe_plugin._achievements_store.record(["Shaper of Worlds"], _UNLOCK_TIMESTAMP)
+    auth_poe_plugin.persistent_cache["achievements_refreshed_at/profile_name"] = str(
+        _UNLOCK_TIMESTAMP - auth_poe_plugin._ACHIEVEMENTS_CACHE_MAX_STALENESS - 1
+    )
+    get_achievements_mock.return_value = _UNLOCKED_ACHIEVEMENTS_SET
+
+    assert await auth_poe_plugin.prepare_achievements_context([game_id]) == _UNLOCKED_ACHIEVEMENTS_SET
+    get_achievements_mock.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_update_credentials(
+    poesessid
+    , profile_name
+    , mocker
+):
+    response_ready = asyncio.Event()
+
+    async def delayed_response(*args, **kwargs):
+        await response_ready.wait()
+        return response_mock(_ACHIEVEMENTS_PAGE.encode("utf-8"))
+
+    authenticated_request_mock = mocker.patch(
+        "poe_plugin.PoeHttpClient._authenticated_request", side_effect=delayed_response
+    )
+    http_client = PoeHttpClient(poesessid, profile_name, MagicMock())
+    try:
+        session = http_client._session
+        stale_request = asyncio.ensure_future(http_client.get_achievements())
+        await asyncio.sleep(0)
+
+        await http_client.update_credentials("other_poesessid", "other_profile", drain_timeout=0)
+
+        with pytest.raises(asyncio.CancelledError):
+            await stale_request
+        assert http_client._session is session
+        assert [(cookie.key, cookie.value) for cookie in session.cookie_jar] == [("POESESSID", "other_poesessid")]
+
+        response_ready.set()
+        assert await http_client.get_achievements() == _UNLOCKED_ACHIEVEMENTS_SET
+        assert authenticated_request_mock.call_args[1]["url"].endswith("/other_profile/achievements")
+    finally:
+        await http_client.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_achievements_streaming(get_achievements_mock, time_mock, auth_poe_plugin, game_id, mocker):
+    async def stream_achievements():
+        for achievement in _UNLOCKED_ACHIEVEMENTS_SET:
+            yield achievement
+
+    mocker.patch.object(auth_poe_plugin, "_ACHIEVEMENTS_STREAMING", True)
+    mocker.patch.object(auth_poe_plugin._http_client, "stream_achievements", side_effect=stream_achievements)
+
+    assert await auth_poe_plugin.prepare_achievements_context([game_id]) == _UNLOCKED_ACHIEVEMENTS_SET
+    get_achievements_mock.assert_not_called()
+    assert auth_poe_plugin.persistent_cache == {
+        "achievements_refreshed_at/profile_name": str(_UNLOCK_TIMESTAMP)
+    }
+
+
+@pytest.mark.asyncio
+async def test_achievements_refresh_time_kept_on_fallback(
+    authenticated_request_mock
+    , time_mock
+    , auth_poe_plugin
+    , game_id
+):
+    authenticated_request_mock.return_value = response_mock(_ACHIEVEMENTS_PAGE.encode("utf-8"))
+    assert await auth_poe_plugin.prepare_achievements_context([game_id]) == _UNLOCKED_ACHIEVEMENTS_SET
+
+    time_mock.return_value += auth_poe_plugin._ACHIEVEMENTS_CACHE_TTL + 1
+    authenticated_request_mock.side_effect = CircuitOpen()
+    assert await auth_poe_plugin.prepare_achievements_context([game_id]) == _UNLOCKED_ACHIEVEMENTS_SET
+    await auth_poe_plugin._achievements_revalidation
+
+    assert authenticated_request_mock.call_count == 2
+    assert auth_poe_plugin.persistent_cache == {
+        "achievements_refreshed_at/profile_name": str(_UNLOCK_TIMESTAMP)
+    }
@@ -1,8 +1,10 @@
+import asyncio
+
 import pytest
-from galaxy.api.errors import InvalidCredentials
+from galaxy.api.errors import AuthenticationRequired, InvalidCredentials
 from galaxy.api.types import Authentication, NextStep
 
-from tests.utils import AsyncMock
+from tests.utils import AsyncMock, MagicMock
 
 
 @pytest.fixture()
@@ -70,3 +72,97 @@ async def test_auth_failed_no_credentials(
         assert await poe_plugin_mock.pass_login_credentials(*auth_params)
     http_client_mock.assert_not_called()
     http_client_mock.return_value.shutdown.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_auth_prefetches_achievements(
+    mock_http_client
+    , poe_plugin
+    , stored_credentials
+    , game_id
+):
+    poe_plugin._ACHIEVEMENTS_PREFETCH = True
+
+    await poe_plugin.authenticate(stored_credentials)
+    await asyncio.sleep(0)
+    mock_http_client.get_achievements.assert_called_once_with()
+
+    assert await poe_plugin.prepare_achievements_context([game_id]) == ()
+    mock_http_client.get_achievements.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_auth_prefetch_auth_lost(
+    mock_http_client
+    , http_client_mock
+    , poe_plugin
+    , lost_authentication_mock
+    , stored_credentials
+    , game_id
+):
+    def auth_lost():
+        http_client_mock.call_args[0][2]()
+        raise AuthenticationRequired()
+
+    poe_plugin._ACHIEVEMENTS_PREFETCH = True
+    mock_http_client.get_achievements.side_effect = auth_lost
+
+    await poe_plugin.authenticate(stored_credentials)
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    lost_authentication_mock.assert_called_once_with()
+    with pytest.raises(AuthenticationRequired):
+        await poe_plugin.prepare_achievements_context([game_id])
+
+
+@pytest.mark.asyncio
+async def test_context_waits_for_prefetch_auth_lost(
+    mock_http_client
+    , http_client_mock
+    , poe_plugin
+    , lost_authentication_mock
+    , stored_credentials
+    , game_id
+):
+    async def auth_lost():
+        await asyncio.sleep(0)
+        http_client_mock.call_args[0][2]()
+        raise AuthenticationRequired()
+
+    poe_plugin._ACHIEVEMENTS_PREFETCH = True
+    mock_http_client.get_achievements = MagicMock(side_effect=auth_lost)
+
+    await poe_plugin.authenticate(stored_credentials)
+    with pytest.raises(AuthenticationRequired):
+        await poe_plugin.prepare_achievements_context([game_id])
+
+    mock_http_client.get_achievements.assert_called_once_with()
+    lost_authentication_mock.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_reauth_keeps_client(
+    mock_http_client
+    , http_client_mock
+    , poe_plugin
+    , lost_authentication_mock
+    , stored_credentials
+    , game_id
+):
+    await poe_plugin.authenticate(stored_credentials)
+    http_client_mock.call_args[0][2]()
+
+    lost_authentication_mock.assert_called_once_with()
+    mock_http_client.shutdown.assert_not_called()
+    with pytest.raises(AuthenticationRequired):
+        await poe_plugin.prepare_achievements_context([game_id])
+
+    await poe_plugin.pass_login_credentials(
+        "step"
+        , {"end_uri": poe_plugin._AUTH_REDIRECT + "other_profile"}
+        , [{"name": "POESESSID", "value": "other_poesessid"}]
+    )
+
+    mock_http_client.update_credentials.assert_called_once_with("other_poesessid", "other_profile")
+    assert await poe_plugin.prepare_achievements_context([game_id]) == ()
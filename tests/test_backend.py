@@ -0,0 +1,224 @@
+import asyncio
+import hashlib
+import os
+import time
+
+import aiohttp
+import pytest
+from galaxy.api.errors import AuthenticationRequired
+
+from poe_download import load_state
+from poe_http_client import LaneOptions, RequestClass
+from poe_retry import RetryPolicy
+from poe_types import DownloadedFile
+
+
+@pytest.mark.asyncio
+async def test_achievements(poe_backend, backend_http_client_factory):
+    poe_backend.set_page_size(1000)
+    http_client = backend_http_client_factory()
+
+    achievements = await http_client.get_achievements()
+
+    assert [achievement.name for achievement in achievements] == poe_backend.completed_achievements
+
+
+@pytest.mark.asyncio
+async def test_stream_achievements(poe_backend, backend_http_client_factory):
+    poe_backend.bandwidth = 10 * 1024 * 1024
+    http_client = backend_http_client_factory()
+
+    assert [
+        achievement.name async for achievement in http_client.stream_achievements()
+    ] == poe_backend.completed_achievements
+
+
+@pytest.mark.asyncio
+async def test_auth_lost(poe_backend, backend_http_client_factory):
+    http_client = backend_http_client_factory(poesessid="expired")
+
+    with pytest.raises(AuthenticationRequired):
+        await http_client.get_achievements()
+
+    http_client._auth_lost_callback.assert_called_once_with()
+    assert poe_backend.requests == [("GET", "/account/view-profile/profile_name/achievements")]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("segment_size", [4 * 1024 * 1024, 16 * 1024])
+async def test_installer(poe_backend, backend_http_client_factory, tmp_path, mocker, segment_size):
+    poe_backend.bandwidth = 50 * 1024 * 1024
+    http_client = backend_http_client_factory()
+    mocker.patch.object(http_client, "_DOWNLOAD_SEGMENT_SIZE", segment_size)
+    installer_path = str(tmp_path / "installer.exe")
+    progress = []
+
+    downloaded = await http_client.download_installer(
+        installer_path, progress_callback=lambda downloaded, total: progress.append((downloaded, total))
+    )
+
+    assert downloaded == DownloadedFile(
+        path=installer_path
+        , sha256=hashlib.sha256(poe_backend.installer).hexdigest()
+        , size=len(poe_backend.installer)
+        , etag=poe_backend.installer_etag
+        , last_modified=None
+    )
+
+    with open(installer_path, "rb") as installer:
+        assert installer.read() == poe_backend.installer
+    assert progress[-1] == (len(poe_backend.installer), len(poe_backend.installer))
+    assert [downloaded for downloaded, _ in progress] == sorted(downloaded for downloaded, _ in progress)
+    assert os.listdir(str(tmp_path)) == ["installer.exe"]
+    assert len(poe_backend.installer_ranges) == -(-len(poe_backend.installer) // segment_size)
+
+
+def interrupt(downloaded, total):
+    if downloaded > total // 2:
+        raise ConnectionResetError()
+
+
+@pytest.mark.asyncio
+async def test_installer_resumed(poe_backend, backend_http_client_factory, tmp_path, mocker):
+    http_client = backend_http_client_factory(
+        lanes={RequestClass.BULK: LaneOptions(1, aiohttp.ClientTimeout(sock_read=60))}
+    )
+    mocker.patch.object(http_client, "_DOWNLOAD_SEGMENT_SIZE", 16 * 1024)
+    mocker.patch.object(http_client, "_FILE_CHUNK_SIZE", 1024)
+    installer_path = str(tmp_path / "installer.exe")
+
+    with pytest.raises(ConnectionResetError):
+        await http_client.download_installer(installer_path, progress_callback=interrupt)
+
+    assert sorted(os.listdir(str(tmp_path))) == ["installer.exe.part", "installer.exe.segments"]
+    completed = len(load_state(installer_path + ".segments").completed)
+    assert 0 < completed < 16
+
+    poe_backend.installer_ranges.clear()
+    progress = []
+    await http_client.download_installer(
+        installer_path, progress_callback=lambda downloaded, total: progress.append(downloaded)
+    )
+
+    with open(installer_path, "rb") as installer:
+        assert installer.read() == poe_backend.installer
+    assert len(poe_backend.installer_ranges) == 16 - completed
+    assert progress[0] > completed * 16 * 1024
+    assert os.listdir(str(tmp_path)) == ["installer.exe"]
+
+
+@pytest.mark.asyncio
+async def test_installer_changed_while_resuming(poe_backend, backend_http_client_factory, tmp_path, mocker):
+    http_client = backend_http_client_factory()
+    mocker.patch.object(http_client, "_DOWNLOAD_SEGMENT_SIZE", 16 * 1024)
+    installer_path = str(tmp_path / "installer.exe")
+
+    with pytest.raises(ConnectionResetError):
+        await http_client.download_installer(installer_path, progress_callback=interrupt)
+
+    poe_backend.installer = bytes(reversed(poe_backend.installer))
+    poe_backend.installer_etag = '"installer-2"'
+    downloaded = await http_client.download_installer(installer_path)
+
+    assert downloaded.sha256 == hashlib.sha256(poe_backend.installer).hexdigest()
+    with open(installer_path, "rb") as installer:
+        assert installer.read() == poe_backend.installer
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("shrunk_size", [64 * 1024, 200 * 1024])
+async def test_installer_shrunk_while_resuming(poe_backend, backend_http_client_factory, tmp_path, mocker, shrunk_size):
+    http_client = backend_http_client_factory(
+        lanes={RequestClass.BULK: LaneOptions(1, aiohttp.ClientTimeout(sock_read=60))}
+    )
+    mocker.patch.object(http_client, "_DOWNLOAD_SEGMENT_SIZE", 16 * 1024)
+    mocker.patch.object(http_client, "_FILE_CHUNK_SIZE", 1024)
+    installer_path = str(tmp_path / "installer.exe")
+
+    with pytest.raises(ConnectionResetError):
+        await http_client.download_installer(installer_path, progress_callback=interrupt)
+    assert min(load_state(installer_path + ".segments").get_pending()) * 16 * 1024 >= 128 * 1024
+
+    poe_backend.installer = poe_backend.installer[:shrunk_size]
+    downloaded = await http_client.download_installer(installer_path)
+
+    assert downloaded.sha256 == hashlib.sha256(poe_backend.installer).hexdigest()
+    assert downloaded.size == shrunk_size
+    with open(installer_path, "rb") as installer:
+        assert installer.read() == poe_backend.installer
+    assert os.listdir(str(tmp_path)) == ["installer.exe"]
+
+
+@pytest.mark.asyncio
+async def test_installer_bandwidth(poe_backend, backend_http_client_factory, tmp_path, mocker):
+    http_client = backend_http_client_factory()
+    mocker.patch.object(http_client, "_DOWNLOAD_SEGMENT_SIZE", 16 * 1024)
+    mocker.patch.object(http_client, "_FILE_CHUNK_SIZE", 16 * 1024)
+    installer_path = str(tmp_path / "installer.exe")
+
+    started = time.monotonic()
+    await http_client.download_installer(installer_path, bandwidth=1024 * 1024)
+
+    assert time.monotonic() - started >= 0.2
+
+
+@pytest.mark.asyncio
+async def test_cancel_download(poe_backend, backend_http_client_factory, tmp_path, mocker):
+    http_client = backend_http_client_factory()
+    mocker.patch.object(http_client, "_DOWNLOAD_SEGMENT_SIZE", 16 * 1024)
+    mocker.patch.object(http_client, "_FILE_CHUNK_SIZE", 16 * 1024)
+    installer_path = str(tmp_path / "installer.exe")
+
+    download = asyncio.ensure_future(http_client.download_installer(installer_path, bandwidth=64 * 1024))
+    await asyncio.sleep(0.3)
+    await http_client.cancel_download(installer_path)
+
+    with pytest.raises(asyncio.CancelledError):
+        await download
+    assert sorted(os.listdir(str(tmp_path))) == ["installer.exe.part", "installer.exe.segments"]
+    assert 0 < len(load_state(installer_path + ".segments").completed) < 16
+
+    await http_client.download_installer(installer_path)
+    with open(installer_path, "rb") as installer:
+        assert installer.read() == poe_backend.installer
+
+
+@pytest.mark.asyncio
+async def test_installer_without_ranges(poe_backend, backend_http_client_factory, tmp_path, mocker):
+    poe_backend.accept_ranges = False
+    http_client = backend_http_client_factory()
+    mocker.patch.object(http_client, "_DOWNLOAD_SEGMENT_SIZE", 16 * 1024)
+    mocker.patch.object(http_client, "_FILE_CHUNK_SIZE", 1024)
+    installer_path = str(tmp_path / "installer.exe")
+
+    with pytest.raises(ConnectionResetError):
+        await http_client.download_installer(installer_path, progress_callback=interrupt)
+    assert os.listdir(str(tmp_path)) == []
+
+    # the interrupted response must not leave a stalled connection in the pool
+    downloaded = await asyncio.wait_for(http_client.download_installer(installer_path), 10)
+
+    assert downloaded.sha256 == hashlib.sha256(poe_backend.installer).hexdigest()
+    assert os.listdir(str(tmp_path)) == ["installer.exe"]
+
+
+@pytest.mark.asyncio
+async def test_transient_errors(poe_backend, backend_http_client_factory):
+    poe_backend.inject_error(503)
+    poe_backend.inject_error(500)
+    http_client = backend_http_client_factory(retry_policy=RetryPolicy(base_delay=0))
+
+    assert len(await http_client.get_achievements()) == len(poe_backend.completed_achievements)
+    assert len(poe_backend.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_latency(poe_backend, backend_http_client_factory):
+    poe_backend.latency = 0.1
+    http_client = backend_http_client_factory()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(http_client.get_achievements() for _ in range(10)))
+
+    assert time.perf_counter() - started < 2 * poe_backend.latency
+    assert len(poe_backend.requests) == 1
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+from galaxy.api.types import Achievement
+
+from poe_catalog import AchievementCatalog, load_ids, main, merge_names, pack_catalog, save_ids
+from poe_types import AchievementId, AchievementName, AchievementRecord
+
+_NAMES = ["Shaper of Worlds", "Augmentation", "New World Order", "Vaal Ascendancy", "Unforgettable", "Çelebi"]
+
+
+@pytest.fixture()
+def catalog_path(tmp_path):
+    path = tmp_path / "achievements.cat"
+    path.write_bytes(pack_catalog(_NAMES))
+    return str(path)
+
+
+def test_lookup(catalog_path):
+    catalog = AchievementCatalog(catalog_path)
+
+    assert len(catalog) == len(_NAMES)
+    for achievement_id, name in enumerate(_NAMES):
+        assert catalog.id_of(AchievementName(name)) == achievement_id
+        assert catalog.name_of(AchievementId(achievement_id)) == name
+    assert catalog.names() == _NAMES
+
+    assert catalog.id_of(AchievementName("Unknown")) is None
+    assert catalog.name_of(AchievementId(len(_NAMES))) is None
+
+    catalog.close()
+
+
+@pytest.mark.parametrize("content", [None, b"", b"POEC", b"NOPE" + pack_catalog(_NAMES)[4:]])
+def test_missing_or_broken_catalog(tmp_path, content):
+    path = tmp_path / "achievements.cat"
+    if content is not None:
+        path.write_bytes(content)
+
+    catalog = AchievementCatalog(str(path))
+
+    assert len(catalog) == 0
+    assert catalog.id_of(AchievementName("Augmentation")) is None
+
+
+def test_merge_keeps_ids_stable():
+    assert merge_names(["b", "a"], ["a", "c", "b", "c"]) == ["b", "a", "c"]
+
+
+def test_ids_round_trip(tmp_path):
+    ids_path = str(tmp_path / "achievement_ids.json")
+    assert load_ids(ids_path) == []
+
+    save_ids(ids_path, merge_names(_NAMES, ["Mirror Shard", "Augmentation"]))
+
+    assert load_ids(ids_path) == _NAMES + ["Mirror Shard"]
+
+
+def test_main(tmp_path):
+    ids_path = tmp_path / "achievement_ids.json"
+    ids_path.write_text(json.dumps(_NAMES))
+    catalog_path = tmp_path / "achievements.cat"
+
+    main(str(ids_path), str(catalog_path))
+
+    catalog = AchievementCatalog(str(catalog_path))
+    assert catalog.names() == _NAMES
+    catalog.close()
+
+
+@pytest.mark.asyncio
+async def test_unlocked_achievements_ids(auth_poe_plugin, game_id, catalog_path, mocker):
+    mocker.patch.object(auth_poe_plugin, "_achievements_catalog", AchievementCatalog(catalog_path))
+    auth_poe_plugin._achievements_store.record(
+        [AchievementName("Augmentation"), AchievementName("Mirror Shard")], 1549494000
+    )
+
+    assert await auth_poe_plugin.get_unlocked_achievements(game_id, (
+        AchievementRecord(AchievementName("Augmentation"), None)
+        , AchievementRecord(AchievementName("Mirror Shard"), None)
+    )) == [
+        Achievement(1549494000, achievement_id="1", achievement_name="Augmentation")
+        , Achievement(1549494000, achievement_name="Mirror Shard")
+    ]
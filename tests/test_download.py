@@ -0,0 +1,67 @@
+import pytest
+
+from poe_download import DownloadState, load_state, parse_content_range, save_state, Throttle
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("bytes 0-99/1000", (0, 99, 1000))
+    , ("bytes 900-999/1000", (900, 999, 1000))
+    , ("bytes 0-999/1000", (0, 999, 1000))
+    , ("bytes 0-1000/1000", None)
+    , ("bytes 100-99/1000", None)
+    , ("bytes */1000", None)
+    , ("bytes 0-99/*", None)
+    , ("", None)
+    , (None, None)
+])
+def test_parse_content_range(value, expected):
+    assert parse_content_range(value) == expected
+
+
+def test_state():
+    state = DownloadState(size=1000, segment_size=300, etag='"1"', last_modified=None, completed={1})
+
+    assert state.segments == 4
+    assert [state.get_range(index) for index in range(state.segments)] == [(0, 299), (300, 599), (600, 899), (900, 999)]
+    assert state.get_pending() == [0, 2, 3]
+    assert state.get_completed_size() == 300
+
+    state.completed.add(3)
+    assert state.get_completed_size() == 400
+    assert state.matches(1000, '"1"', None)
+    assert not state.matches(1000, '"2"', None)
+    assert not state.matches(1001, '"1"', None)
+
+
+def test_state_persistence(tmp_path):
+    path = str(tmp_path / "installer.exe.segments")
+    assert load_state(path) is None
+
+    state = DownloadState(size=1000, segment_size=300, etag=None, last_modified="yesterday", completed={0, 2})
+    save_state(path, state)
+    assert load_state(path) == state
+
+    with open(path, "w") as state_file:
+        state_file.write('{"size": 1000')
+    assert load_state(path) is None
+
+
+@pytest.mark.asyncio
+async def test_throttle(mocker):
+    now = [100.0]
+    waits = []
+
+    async def wait(delay):
+        waits.append(delay)
+        now[0] += delay
+
+    throttle = Throttle(1000)
+    mocker.patch.object(throttle, "_now", side_effect=lambda: now[0])
+    mocker.patch.object(throttle, "_wait", side_effect=wait)
+
+    await throttle.consume(500)
+    await throttle.consume(1000)
+    now[0] += 5
+    await throttle.consume(250)
+
+    assert waits == [0.5, 1.0, 0.25]
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+from galaxy.api.errors import AuthenticationRequired
+
+from poe_metrics import Histogram
+
+
+def test_histogram():
+    histogram = Histogram((1, 10))
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+
+    assert histogram.to_dict() == {
+        "count": 4, "sum": 56.5, "max": 50, "buckets": {"1": 2, "10": 1, "+Inf": 1}
+    }
+
+
+@pytest.mark.asyncio
+async def test_achievements_metrics(backend_http_client_factory, poe_backend):
+    http_client = backend_http_client_factory()
+
+    await http_client.get_achievements()
+    await http_client.get_achievements()
+
+    metrics = http_client.metrics.snapshot()["achievements"]
+    assert metrics["requests"] == 2
+    assert metrics["statuses"] == {"200": 2}
+    assert metrics["response_bytes"] == 2 * len(poe_backend.achievements_page)
+    assert metrics["response_size"]["count"] == 2
+    assert metrics["latency"]["connect"]["count"] == 1
+    assert metrics["latency"]["ttfb"]["count"] == 2
+    assert metrics["latency"]["total"]["count"] == 2
+    assert metrics["auth_lost"] == 0
+
+
+@pytest.mark.asyncio
+async def test_auth_lost_metrics(backend_http_client_factory):
+    http_client = backend_http_client_factory(profile_name="lost")
+
+    with pytest.raises(AuthenticationRequired):
+        await http_client.get_achievements()
+
+    metrics = http_client.metrics.snapshot()["achievements"]
+    assert metrics["statuses"] == {"302": 1}
+    assert metrics["auth_lost"] == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_dump(backend_http_client_factory, tmp_path):
+    metrics_path = str(tmp_path / "metrics" / "http_metrics.json")
+    http_client = backend_http_client_factory(metrics_path=metrics_path)
+
+    await http_client.get_achievements()
+    await http_client.shutdown()
+
+    with open(metrics_path) as metrics_file:
+        assert json.load(metrics_file)["endpoints"] == http_client.metrics.snapshot()
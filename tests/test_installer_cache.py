@@ -0,0 +1,132 @@
+import hashlib
+import os
+
+import pytest
+
+from poe_installer_cache import InstallerCache
+from poe_types import DownloadedFile
+
+_KEY = "PathOfExileInstaller.exe"
+
+
+@pytest.fixture()
+def cache_dir(tmp_path):
+    return str(tmp_path / "installer")
+
+
+def stage(cache: InstallerCache, content: bytes, key: str = _KEY, etag: str = None) -> DownloadedFile:
+    path = cache.get_staging_path(key)
+    with open(path, "wb") as staged:
+        staged.write(content)
+
+    return DownloadedFile(
+        path=path, sha256=hashlib.sha256(content).hexdigest(), size=len(content), etag=etag, last_modified=None
+    )
+
+
+@pytest.mark.asyncio
+async def test_put_and_get(cache_dir):
+    cache = InstallerCache(cache_dir, 1024)
+    assert await cache.get(_KEY) is None
+
+    downloaded = stage(cache, b"installer", etag='"1"')
+    path = cache.put(_KEY, downloaded)
+
+    assert path == os.path.join(cache_dir, downloaded.sha256 + ".exe")
+    assert sorted(os.listdir(cache_dir)) == sorted([os.path.basename(path), "index.json"])
+
+    cached = await InstallerCache(cache_dir, 1024).get(_KEY)
+    assert cached == downloaded._replace(path=path)
+
+
+@pytest.mark.asyncio
+async def test_new_version_replaces_blob(cache_dir):
+    cache = InstallerCache(cache_dir, 1024)
+    old_path = cache.put(_KEY, stage(cache, b"old"))
+    new_path = cache.put(_KEY, stage(cache, b"new"))
+
+    assert not os.path.exists(old_path)
+    assert sorted(os.listdir(cache_dir)) == sorted([os.path.basename(new_path), "index.json"])
+
+
+@pytest.mark.asyncio
+async def test_same_content_is_stored_once(cache_dir):
+    cache = InstallerCache(cache_dir, 1024)
+    path = cache.put(_KEY, stage(cache, b"installer"))
+
+    assert cache.put("Other.exe", stage(cache, b"installer", "Other.exe")) == path
+    assert sorted(os.listdir(cache_dir)) == sorted([os.path.basename(path), "index.json"])
+
+
+@pytest.mark.asyncio
+async def test_corrupted_entry_is_dropped(cache_dir):
+    cache = InstallerCache(cache_dir, 1024)
+    path = cache.put(_KEY, stage(cache, b"installer"))
+    with open(path, "wb") as blob:
+        blob.write(b"tampered")
+
+    assert await cache.get(_KEY) is None
+    assert os.listdir(cache_dir) == ["index.json"]
+
+
+@pytest.mark.asyncio
+async def test_eviction(cache_dir, mocker):
+    time_mock = mocker.patch("poe_installer_cache.time.time")
+    cache = InstallerCache(cache_dir, 10)
+
+    time_mock.return_value = 1
+    cache.put("a.exe", stage(cache, b"aaaa", "a.exe"))
+    time_mock.return_value = 2
+    cache.put("b.exe", stage(cache, b"bbbb", "b.exe"))
+    time_mock.return_value = 3
+    cache.put("a.exe", await cache.get("a.exe"))
+    time_mock.return_value = 4
+    cache.put("c.exe", stage(cache, b"cccc", "c.exe"))
+
+    assert await cache.get("b.exe") is None
+    assert await cache.get("a.exe") is not None
+    assert await cache.get("c.exe") is not None
+
+    time_mock.return_value = 5
+    cache.put("d.exe", stage(cache, b"d" * 20, "d.exe"))
+
+    assert sorted(os.listdir(cache_dir)) == sorted([
+        hashlib.sha256(b"d" * 20).hexdigest() + ".exe", "index.json"
+    ])
+
+
+def test_cleanup(cache_dir):
+    cache = InstallerCache(cache_dir, 1024)
+    path = cache.put(_KEY, stage(cache, b"installer"))
+    resumable = ["interrupted.exe.download.part", "interrupted.exe.download.segments"]
+    for leftover in resumable + ["interrupted.exe.download", "orphan.exe"]:
+        with open(os.path.join(cache_dir, leftover), "wb") as leftover_file:
+            leftover_file.write(b"leftover")
+
+    InstallerCache(cache_dir, 1024).get_staging_path(_KEY)
+
+    assert sorted(os.listdir(cache_dir)) == sorted([os.path.basename(path), "index.json"] + resumable)
+
+
+@pytest.mark.asyncio
+async def test_revalidation(poe_backend, backend_http_client_factory, cache_dir):
+    http_client = backend_http_client_factory()
+    cache = InstallerCache(cache_dir, 1024 * 1024)
+
+    async def get_installer():
+        cached = await cache.get(_KEY)
+        return cache.put(_KEY, await http_client.download_installer(cache.get_staging_path(_KEY), cached=cached))
+
+    path = await get_installer()
+    with open(path, "rb") as installer:
+        assert installer.read() == poe_backend.installer
+
+    assert await get_installer() == path
+    assert http_client.metrics.snapshot()[http_client.INSTALLER_ENDPOINT]["statuses"] == {"206": 1, "304": 1}
+
+    poe_backend.installer = b"new installer"
+    poe_backend.installer_etag = '"installer-2"'
+    new_path = await get_installer()
+    with open(new_path, "rb") as installer:
+        assert installer.read() == b"new installer"
+    assert not os.path.exists(path)
@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+
+import pytest
+from galaxy.api.types import LocalGameState
+
+from poe_types import DownloadedFile
+from tests.utils import AsyncMock, MagicMock
+
+_INSTALLER = b"installer"
+
+
+@pytest.fixture()
+def download_installer(mock_http_client):
+    download_ready = asyncio.Event()
+    download_ready.set()
+
+    async def download(path, cached=None, **kwargs):
+        await download_ready.wait()
+        with open(path, "wb") as installer:
+            installer.write(_INSTALLER)
+        return DownloadedFile(path, hashlib.sha256(_INSTALLER).hexdigest(), len(_INSTALLER), '"1"', None)
+
+    mock_http_client.download_installer = MagicMock(side_effect=download)
+    mock_http_client.cancel_download = AsyncMock()
+    mock_http_client.download_ready = download_ready
+    return mock_http_client.download_installer
+
+
+@pytest.fixture()
+def prefetch_plugin(poe_plugin, mocker):
+    mocker.patch.object(poe_plugin, "_INSTALLER_PREFETCH", True)
+    poe_plugin._game_state = LocalGameState.None_
+    return poe_plugin
+
+
+@pytest.mark.asyncio
+async def test_prefetch(mock_http_client, download_installer, prefetch_plugin, stored_credentials):
+    await prefetch_plugin.authenticate(stored_credentials)
+    await prefetch_plugin._installer_prefetch
+
+    download_installer.assert_called_once_with(
+        prefetch_plugin._installer_cache.get_staging_path(prefetch_plugin._INSTALLER_BIN)
+        , cached=None
+        , bandwidth=prefetch_plugin._INSTALLER_PREFETCH_BANDWIDTH
+    )
+    assert prefetch_plugin._installer_prefetched
+
+    path = await prefetch_plugin._fetch_installer()
+    with open(path, "rb") as installer:
+        assert installer.read() == _INSTALLER
+    download_installer.assert_called_once()
+
+    await prefetch_plugin.shutdown()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prefetch, game_state", [
+    (False, LocalGameState.None_)
+    , (True, LocalGameState.Installed)
+    , (True, LocalGameState.Running)
+])
+async def test_no_prefetch(
+    mock_http_client, download_installer, poe_plugin, stored_credentials, mocker, prefetch, game_state
+):
+    mocker.patch.object(poe_plugin, "_INSTALLER_PREFETCH", prefetch)
+    poe_plugin._game_state = game_state
+
+    await poe_plugin.authenticate(stored_credentials)
+
+    assert poe_plugin._installer_prefetch is None
+    download_installer.assert_not_called()
+
+    await poe_plugin.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_paused(mock_http_client, download_installer, prefetch_plugin, stored_credentials):
+    mock_http_client.download_ready.clear()
+    await prefetch_plugin.authenticate(stored_credentials)
+    await asyncio.sleep(0)
+    prefetch = prefetch_plugin._installer_prefetch
+
+    prefetch_plugin._game_state = LocalGameState.Running
+    prefetch_plugin._update_installer_prefetch()
+    await asyncio.wait([prefetch])
+
+    assert prefetch.cancelled()
+    mock_http_client.cancel_download.assert_called_once_with(
+        prefetch_plugin._installer_cache.get_staging_path(prefetch_plugin._INSTALLER_BIN)
+    )
+    assert not prefetch_plugin._installer_prefetched
+
+    mock_http_client.download_ready.set()
+    prefetch_plugin._game_state = LocalGameState.None_
+    prefetch_plugin._update_installer_prefetch()
+    await prefetch_plugin._installer_prefetch
+
+    assert prefetch_plugin._installer_prefetched
+    assert download_installer.call_count == 2
+
+    await prefetch_plugin.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_stopped_on_auth_lost(
+    mock_http_client, http_client_mock, download_installer, prefetch_plugin, stored_credentials, mocker
+):
+    mocker.patch("poe_plugin.PoePlugin.lost_authentication")
+    mock_http_client.download_ready.clear()
+    await prefetch_plugin.authenticate(stored_credentials)
+    await asyncio.sleep(0)
+    prefetch = prefetch_plugin._installer_prefetch
+
+    http_client_mock.call_args[0][2]()
+    await asyncio.wait([prefetch])
+
+    assert prefetch.cancelled()
+
+    await prefetch_plugin.shutdown()
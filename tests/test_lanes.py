@@ -0,0 +1,111 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from poe_http_client import LaneOptions, PoeHttpClient, RequestClass
+
+from tests.utils import MagicMock, response_mock
+
+_PAGE = b'<div class="achievement-list"><div class="achievement"><h2>Augmentation</h2></div></div>'
+
+
+@pytest.fixture()
+def backend(mocker):
+    backend = MagicMock()
+    backend.started = []
+    backend.installer_ready = asyncio.Event()
+    backend.achievements_ready = asyncio.Event()
+    backend.achievements_ready.set()
+
+    async def request(method, *args, url, endpoint, **kwargs):
+        backend.started.append((endpoint, kwargs["timeout"]))
+        if endpoint == PoeHttpClient.INSTALLER_ENDPOINT:
+            await backend.installer_ready.wait()
+            return response_mock(b"installer")
+
+        await backend.achievements_ready.wait()
+        return response_mock(_PAGE)
+
+    mocker.patch("poe_http_client.PoeHttpClient._authenticated_request", side_effect=request)
+    return backend
+
+
+@pytest.fixture()
+async def http_client(poesessid, profile_name):
+    http_client = PoeHttpClient(
+        poesessid
+        , profile_name
+        , MagicMock()
+        , lanes={RequestClass.BULK: LaneOptions(1, aiohttp.ClientTimeout(sock_read=60))}
+    )
+    yield http_client
+    await http_client.shutdown()
+
+
+@pytest.fixture()
+def installer_path(tmp_path):
+    return str(tmp_path / "installer.exe")
+
+
+@pytest.mark.asyncio
+async def test_download_does_not_block_achievements(backend, http_client, installer_path):
+    download = asyncio.ensure_future(http_client.download_installer(installer_path))
+    await asyncio.sleep(0)
+
+    assert len(await asyncio.wait_for(http_client.get_achievements(), 1)) == 1
+    assert not download.done()
+
+    backend.installer_ready.set()
+    assert (await download).path == installer_path
+    assert [timeout for _, timeout in backend.started] == [
+        aiohttp.ClientTimeout(sock_read=60), aiohttp.ClientTimeout(total=30, sock_connect=10)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_waits_for_interactive(backend, http_client, installer_path):
+    backend.achievements_ready.clear()
+    backend.installer_ready.set()
+
+    achievements = asyncio.ensure_future(http_client.get_achievements())
+    await asyncio.sleep(0)
+    download = asyncio.ensure_future(http_client.download_installer(installer_path))
+    await asyncio.sleep(0.01)
+    assert [endpoint for endpoint, _ in backend.started] == [PoeHttpClient.ACHIEVEMENTS_ENDPOINT]
+
+    backend.achievements_ready.set()
+    await asyncio.gather(achievements, download)
+    assert [endpoint for endpoint, _ in backend.started] == [
+        PoeHttpClient.ACHIEVEMENTS_ENDPOINT, PoeHttpClient.INSTALLER_ENDPOINT
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_concurrency_cap(backend, http_client, tmp_path):
+    downloads = asyncio.gather(*(
+        http_client.download_installer(str(tmp_path / f"installer_{index}.exe")) for index in range(2)
+    ))
+    await asyncio.sleep(0.01)
+    assert len(backend.started) == 1
+
+    backend.installer_ready.set()
+    await downloads
+    assert len(backend.started) == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_stream_consumer_does_not_block_interactive(backend, poesessid, profile_name):
+    http_client = PoeHttpClient(
+        poesessid
+        , profile_name
+        , MagicMock()
+        , lanes={RequestClass.INTERACTIVE: LaneOptions(1, aiohttp.ClientTimeout(total=30))}
+    )
+    stream = http_client.stream_achievements()
+
+    assert (await stream.__anext__()).name == "Augmentation"
+    assert len(await asyncio.wait_for(http_client.get_achievements(), 1)) == 1
+
+    await stream.aclose()
+    await http_client.shutdown()
@@ -4,28 +4,20 @@ if platform.system() == "Windows":
     import os
     import subprocess
     import winreg
-    from unittest.mock import MagicMock
 
     import pytest
     from galaxy.api.types import LocalGame, LocalGameState
 
     from poe_plugin import PoePlugin
+    from poe_processes import FakeProcessSource, ProcessScanner
 
 
-    def proc_mock(name):
-        proc = MagicMock(spec=())
-        proc.binary_path = name
-        return proc
-
-
-    _PROCESS_LIST_NOT_RUNNING = [
-        proc_mock(name)
-        for name in ("c:\\opera.exe", "d:\\GalaxyClient.exe", "d:\\PathOfExile not game.exe", "e:\\not PathOfExile.exe")
-    ]
-    _PROCESS_LIST_RUNNING = [
-        proc_mock(name)
-        for name in ("c:\\opera.exe", "d:\\GalaxyClient.exe", "d:\\PathOfExile_x64.exe")
-    ]
+    _PROCESS_LIST_NOT_RUNNING = dict(enumerate(
+        ("c:\\opera.exe", "d:\\GalaxyClient.exe", "d:\\PathOfExile not game.exe", "e:\\not PathOfExile.exe", None)
+    ))
+    _PROCESS_LIST_RUNNING = dict(enumerate(
+        ("c:\\opera.exe", "d:\\GalaxyClient.exe", "d:\\PathOfExile_x64.exe")
+    ))
 
     _GAME_BIN = PoePlugin._GAME_BIN
     _GAME_ID = PoePlugin._GAME_ID
@@ -40,8 +32,10 @@ if platform.system() == "Windows":
 
 
     @pytest.fixture()
-    def process_iter_mock(mocker):
-        return mocker.patch("poe_plugin.process_iter")
+    def process_source(poe_plugin):
+        process_source = FakeProcessSource()
+        poe_plugin._process_scanner = ProcessScanner(process_source, PoePlugin._PROC_NAMES)
+        return process_source
 
 
     @pytest.fixture()
@@ -51,8 +45,8 @@ if platform.system() == "Windows":
 
     @pytest.mark.asyncio
     @pytest.mark.parametrize("install_path, is_installed, process_list, game_state", [
-        (None, False, [], _GAME_STATE_NOT_INSTALLED)
-        , ("installed", False, [], _GAME_STATE_NOT_INSTALLED)
+        (None, False, {}, _GAME_STATE_NOT_INSTALLED)
+        , ("installed", False, {}, _GAME_STATE_NOT_INSTALLED)
         , ("installed", True, _PROCESS_LIST_NOT_RUNNING, _GAME_STATE_INSTALLED)
         , ("installed", True, _PROCESS_LIST_RUNNING, _GAME_STATE_RUNNING)
     ])
@@ -64,15 +58,14 @@ if platform.system() == "Windows":
         , poe_plugin
         , game_id
         , path_exists_mock
-        , process_iter_mock
+        , process_source
     ):
         poe_plugin._install_path = install_path
         path_exists_mock.return_value = is_installed
-        process_iter_mock.return_value = process_list
+        process_source.processes = process_list
 
         assert [game_state] == await poe_plugin.get_local_games()
-        if is_installed:
-            process_iter_mock.assert_called_once_with()
+        assert bool(process_source.lookups) == is_installed
         if install_path and is_installed:
             path_exists_mock.assert_called_once_with(
                 os.path.join(install_path, _GAME_BIN)
@@ -81,8 +74,8 @@ if platform.system() == "Windows":
 
     @pytest.mark.asyncio
     @pytest.mark.parametrize("install_path, is_installed, process_list, game_state", [
-        (None, False, [], _GAME_STATE_NOT_INSTALLED)
-        , ("installed", False, [], _GAME_STATE_NOT_INSTALLED)
+        (None, False, {}, _GAME_STATE_NOT_INSTALLED)
+        , ("installed", False, {}, _GAME_STATE_NOT_INSTALLED)
         , ("installed", True, _PROCESS_LIST_NOT_RUNNING, _GAME_STATE_INSTALLED)
         , ("installed", True, _PROCESS_LIST_RUNNING, _GAME_STATE_RUNNING)
     ])
@@ -95,7 +88,7 @@ if platform.system() == "Windows":
         , game_id
         , reg_query_value_mock
         , path_exists_mock
-        , process_iter_mock
+        , process_source
         , mocker
     ):
         if not is_installed:
@@ -104,14 +97,13 @@ if platform.system() == "Windows":
 
         reg_query_value_mock.return_value = (install_path, winreg.REG_SZ)
         path_exists_mock.return_value = is_installed
-        process_iter_mock.return_value = process_list
+        process_source.processes = process_list
         game_state_update_mock = mocker.patch("poe_plugin.PoePlugin.update_local_game_status")
 
         poe_plugin.tick()
 
         game_state_update_mock.assert_called_once_with(game_state)
-        if is_installed:
-            process_iter_mock.assert_called_once_with()
+        assert bool(process_source.lookups) == is_installed
 
         if install_path:
             if is_installed:
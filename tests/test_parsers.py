@@ -0,0 +1,41 @@
+import pytest
+
+from poe_parsers import ACHIEVEMENTS_PARSERS
+from poe_types import AchievementName, AchievementProgress, AchievementRecord
+from tests.test_achievements import _ACHIEVEMENTS_PAGE, _BROKEN_ACHIEVEMENTS_PAGES, _UNLOCKED_ACHIEVEMENTS_SET
+
+
+@pytest.fixture(params=sorted(ACHIEVEMENTS_PARSERS))
+def achievements_parser(request):
+    return ACHIEVEMENTS_PARSERS[request.param]
+
+
+@pytest.mark.parametrize("backend_response, achievements", [
+    ("", ())
+    , ("<div class=\"achievement-list\"></div>", ())
+    , (_ACHIEVEMENTS_PAGE, _UNLOCKED_ACHIEVEMENTS_SET)
+    , (
+        "<div class=\"achievement\"><h2><span>Zana</span>'s &amp; Friends</h2></div>"
+        , (AchievementRecord(AchievementName("Zana's & Friends"), None),)
+    )
+    , (
+        "<div class=\"achievement\"><h2>Ezé</h2><h2 class=\"completion-detail\"><span>3</span>/3</h2></div>"
+        , (AchievementRecord(AchievementName("Ezé"), AchievementProgress((3, 3))),)
+    )
+    , (
+        "<div class=\"achievement\"><h2>Ezé</h2><h2 class=\"completion-detail\">all</h2></div>"
+        , (AchievementRecord(AchievementName("Ezé"), None),)
+    )
+    , (
+        "<div class=\"achievement\"><h2>\n    Shaper of\n    Worlds\n</h2></div>"
+        , (AchievementRecord(AchievementName("Shaper of Worlds"), None),)
+    )
+])
+def test_parse_achievements(backend_response, achievements, achievements_parser):
+    assert achievements_parser(backend_response.encode("utf-8")) == achievements
+
+
+@pytest.mark.parametrize("backend_response", _BROKEN_ACHIEVEMENTS_PAGES)
+def test_parse_achievements_failure(backend_response, achievements_parser):
+    with pytest.raises(ValueError):
+        achievements_parser(backend_response.encode("utf-8"))
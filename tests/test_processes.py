@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+from poe_processes import FakeProcessSource, ProcessScanner
+
+_PROC_NAMES = ["pathofexile.exe", "pathofexile_x64.exe"]
+
+
+def binary_path(*parts: str) -> str:
+    return os.path.join(os.path.sep, "games", *parts)
+
+
+@pytest.fixture()
+def process_source() -> FakeProcessSource:
+    return FakeProcessSource({
+        pid: binary_path(f"app_{pid}.exe") for pid in range(1, 101)
+    })
+
+
+@pytest.fixture()
+def scanner(process_source) -> ProcessScanner:
+    return ProcessScanner(process_source, _PROC_NAMES)
+
+
+@pytest.mark.parametrize("path, running", [
+    (binary_path("Path of Exile", "PathOfExile_x64.exe"), True)
+    , (binary_path("Path of Exile", "PATHOFEXILE.EXE"), True)
+    , (binary_path("Path of Exile", "not PathOfExile.exe"), False)
+    , (binary_path("PathOfExile.exe", "launcher.exe"), False)
+    , (None, False)
+])
+def test_is_running(process_source, scanner, path, running):
+    process_source.processes[1000] = path
+
+    assert scanner.is_running() == running
+
+
+def test_only_new_pids_are_inspected(process_source, scanner):
+    assert not scanner.is_running()
+    assert process_source.lookups == 100
+
+    process_source.lookups = 0
+    process_source.processes[200] = binary_path("new.exe")
+    assert not scanner.is_running()
+    assert process_source.lookups == 1
+
+
+def test_running_game_is_confirmed_by_pid(process_source, scanner):
+    process_source.processes[200] = binary_path("Path of Exile", "PathOfExile_x64.exe")
+    assert scanner.is_running()
+
+    process_source.lookups = 0
+    assert scanner.is_running()
+    assert process_source.lookups == 1
+
+    del process_source.processes[200]
+    assert not scanner.is_running()
+
+
+def test_reused_pid_is_classified_again(process_source, scanner):
+    assert not scanner.is_running()
+
+    del process_source.processes[50]
+    assert not scanner.is_running()
+
+    process_source.processes[50] = binary_path("Path of Exile", "PathOfExile.exe")
+    assert scanner.is_running()
+
+
+def test_no_binary_names(process_source):
+    process_source.processes[200] = binary_path("Path of Exile", "PathOfExile.exe")
+
+    assert not ProcessScanner(process_source, []).is_running()
+
+
+def test_unknown_binary_is_inspected_with_backoff(process_source, scanner):
+    process_source.processes[200] = None
+    assert not scanner.is_running()
+
+    process_source.lookups = 0
+    for _ in range(15):
+        assert not scanner.is_running()
+    assert process_source.lookups == 4
+
+    process_source.processes[200] = binary_path("Path of Exile", "PathOfExile.exe")
+    assert any(scanner.is_running() for _ in range(scanner._UNKNOWN_RETRY_MAX))
+
+
+def test_pid_reused_between_scans(process_source, scanner):
+    assert not scanner.is_running()
+
+    process_source.processes[50] = binary_path("Path of Exile", "PathOfExile.exe")
+    process_source.create_times[50] = 1.0
+    assert any(scanner.is_running() for _ in range(-(-len(process_source.processes) // scanner._RECHECK_BATCH)))
+
+
+def test_classified_pids_are_not_looked_up_again(process_source, scanner):
+    assert not scanner.is_running()
+
+    process_source.lookups = 0
+    process_source.create_time_lookups = 0
+    assert not scanner.is_running()
+    assert process_source.lookups == 0
+    assert process_source.create_time_lookups == scanner._RECHECK_BATCH
@@ -0,0 +1,86 @@
+import pytest
+
+from poe_rate_limit import RateLimiter
+
+_RATE_LIMIT_HEADERS = {
+    "X-Rate-Limit-Rules": "Ip"
+    , "X-Rate-Limit-Ip": "3:10:60,10:60:300"
+    , "X-Rate-Limit-Ip-State": "1:10:0,1:60:0"
+}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+        self.waits = []
+
+    def time(self) -> float:
+        return self.now
+
+    async def wait(self, delay: float):
+        self.waits.append(delay)
+        self.now += delay
+
+
+@pytest.fixture()
+def clock(mocker):
+    clock = _Clock()
+    mocker.patch.object(RateLimiter, "_now", side_effect=clock.time, autospec=False)
+    mocker.patch.object(RateLimiter, "_wait", side_effect=clock.wait, autospec=False)
+    return clock
+
+
+@pytest.mark.asyncio
+async def test_unknown_limits(clock):
+    rate_limiter = RateLimiter()
+
+    for _ in range(10):
+        await rate_limiter.acquire()
+    assert clock.waits == []
+
+
+@pytest.mark.asyncio
+async def test_stays_under_limits(clock):
+    rate_limiter = RateLimiter(margin=1)
+    await rate_limiter.acquire()
+    rate_limiter.update(_RATE_LIMIT_HEADERS)
+
+    await rate_limiter.acquire()
+    assert clock.waits == []
+
+    await rate_limiter.acquire()
+    assert clock.waits == [10]
+
+
+@pytest.mark.asyncio
+async def test_server_state_accounted(clock):
+    rate_limiter = RateLimiter(margin=0)
+    rate_limiter.update(dict(_RATE_LIMIT_HEADERS, **{"X-Rate-Limit-Ip-State": "3:10:0,3:60:0"}))
+
+    await rate_limiter.acquire()
+    assert clock.waits == [10]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("headers, delay", [
+    ({"Retry-After": "42"}, 42)
+    , (dict(_RATE_LIMIT_HEADERS, **{"X-Rate-Limit-Ip-State": "1:10:0,10:60:120"}), 120)
+])
+async def test_penalty_honoured(clock, headers, delay):
+    rate_limiter = RateLimiter()
+    rate_limiter.update(headers)
+
+    assert rate_limiter.get_delay() == delay
+    await rate_limiter.acquire()
+    assert clock.waits == [delay]
+
+
+@pytest.mark.asyncio
+async def test_retry_after_honoured(poe_backend, backend_http_client_factory, clock):
+    poe_backend.inject_error(429, {"Retry-After": "7"})
+    poe_backend.rate_limit_headers = _RATE_LIMIT_HEADERS
+    http_client = backend_http_client_factory()
+
+    assert len(await http_client.get_achievements()) == len(poe_backend.completed_achievements)
+    assert clock.waits == [7]
+    assert len(poe_backend.requests) == 2
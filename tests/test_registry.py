@@ -0,0 +1,68 @@
+import pytest
+
+from poe_registry import FakeRegistryBackend, HKEY_LOCAL_MACHINE, UNINSTALL_KEY, UninstallEntryIndex
+
+_DISPLAY_NAME = "Path of Exile"
+
+
+def add_entry(registry: FakeRegistryBackend, subkey: str, **values):
+    for name, value in values.items():
+        registry.set_value(HKEY_LOCAL_MACHINE, UNINSTALL_KEY + "\\" + subkey, name, value)
+
+
+@pytest.fixture()
+def registry() -> FakeRegistryBackend:
+    registry = FakeRegistryBackend()
+    for index in range(20):
+        add_entry(registry, f"{{{index:08}}}", DisplayName=f"Application {index}", Installed=1)
+    add_entry(registry, "{uninstalled}", DisplayName=_DISPLAY_NAME, Installed=0, BundleCachePath="old")
+    add_entry(registry, "{poe}", DisplayName=_DISPLAY_NAME, Installed=1, BundleCachePath="installer.exe")
+    return registry
+
+
+@pytest.fixture()
+def index(registry) -> UninstallEntryIndex:
+    return UninstallEntryIndex(registry, _DISPLAY_NAME, value_names=["BundleCachePath"])
+
+
+def test_find(registry, index):
+    assert index.find() == {"DisplayName": _DISPLAY_NAME, "Installed": 1, "BundleCachePath": "installer.exe"}
+
+
+def test_repeated_find_is_a_single_query(registry, index):
+    index.find()
+    registry.queries = 0
+
+    assert index.find()["BundleCachePath"] == "installer.exe"
+    assert registry.queries == 1
+
+
+def test_invalidated_by_last_write(registry, index):
+    index.find()
+    registry.delete_key(HKEY_LOCAL_MACHINE, UNINSTALL_KEY + "\\{poe}")
+
+    assert index.find() is None
+
+    add_entry(registry, "{poe reinstalled}", DisplayName=_DISPLAY_NAME, Installed=1, BundleCachePath="new.exe")
+    assert index.find()["BundleCachePath"] == "new.exe"
+
+
+def test_refresh(registry, index):
+    index.find()
+    add_entry(registry, "{poe}", BundleCachePath="updated.exe")
+
+    assert index.find()["BundleCachePath"] == "installer.exe"
+    assert index.find(refresh=True)["BundleCachePath"] == "updated.exe"
+
+
+def test_missing_key():
+    assert UninstallEntryIndex(FakeRegistryBackend(), _DISPLAY_NAME).find() is None
+
+
+def test_fake_registry_is_case_insensitive(registry):
+    assert registry.query_values(HKEY_LOCAL_MACHINE, UNINSTALL_KEY.lower() + "\\{POE}", ["Installed"]) == {
+        "Installed": 1
+    }
+    assert "{poe}" in registry.enum_keys(HKEY_LOCAL_MACHINE, UNINSTALL_KEY)
+    with pytest.raises(FileNotFoundError):
+        registry.query_info(HKEY_LOCAL_MACHINE, UNINSTALL_KEY + "\\{missing}")
@@ -0,0 +1,131 @@
+import pytest
+from galaxy.api.errors import AuthenticationRequired, BackendError, NetworkError, TooManyRequests, UnknownError
+
+from poe_http_client import PoeHttpClient
+from poe_retry import CircuitBreaker, CircuitOpen, RetryPolicy
+
+from tests.utils import AsyncMock, MagicMock, response_mock
+
+_PAGE = b'<div class="achievement-list"><div class="achievement"><h2>Augmentation</h2></div></div>'
+
+
+@pytest.fixture()
+def monotonic_mock(mocker):
+    return mocker.patch("poe_retry.time.monotonic", return_value=1000.0)
+
+
+@pytest.fixture()
+def request_mock(mocker):
+    return mocker.patch("poe_http_client.PoeHttpClient._send", new_callable=AsyncMock)
+
+
+@pytest.fixture()
+def sleep_mock(mocker):
+    return mocker.patch("poe_http_client.asyncio.sleep", new_callable=AsyncMock)
+
+
+@pytest.fixture()
+async def http_client(poesessid, profile_name):
+    http_client = PoeHttpClient(
+        poesessid
+        , profile_name
+        , MagicMock()
+        , retry_policy=RetryPolicy(retries=2)
+        , circuit_breaker=CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    )
+    yield http_client
+    await http_client.shutdown()
+
+
+def test_retry_delay(mocker):
+    mocker.patch("poe_retry.random.uniform", side_effect=lambda low, high: high)
+    policy = RetryPolicy(base_delay=1, max_delay=5)
+
+    assert [policy.get_delay(attempt) for attempt in range(4)] == [1, 2, 4, 5]
+
+
+def test_circuit_breaker(monotonic_mock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+
+    breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.check()
+
+    monotonic_mock.return_value += 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.check()
+    with pytest.raises(CircuitOpen):
+        breaker.check()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    monotonic_mock.return_value += 30
+    breaker.check()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.check()
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_retried(http_client, request_mock, sleep_mock, monotonic_mock):
+    request_mock.side_effect = [NetworkError(), BackendError(), response_mock(_PAGE)]
+
+    assert len(await http_client.get_achievements()) == 1
+    assert request_mock.call_count == 3
+    assert sleep_mock.call_count == 2
+    assert http_client._circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_retries_exhausted(http_client, request_mock, sleep_mock, monotonic_mock):
+    request_mock.side_effect = NetworkError()
+
+    with pytest.raises(NetworkError):
+        await http_client.get_achievements()
+    assert request_mock.call_count == 3
+
+    request_mock.reset_mock()
+    with pytest.raises(CircuitOpen):
+        await http_client.get_achievements()
+    request_mock.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_without_delay_backs_off(http_client, request_mock, sleep_mock, monotonic_mock):
+    request_mock.side_effect = [TooManyRequests(), TooManyRequests(), response_mock(_PAGE)]
+
+    assert len(await http_client.get_achievements()) == 1
+    assert request_mock.call_count == 3
+    assert sleep_mock.call_count == 2
+    assert http_client._circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("response, error", [
+    (response_mock(status=302), AuthenticationRequired)
+    , (UnknownError(), UnknownError)
+])
+async def test_not_retried(http_client, request_mock, sleep_mock, response, error):
+    request_mock.side_effect = [response]
+
+    with pytest.raises(error):
+        await http_client.get_achievements()
+    request_mock.assert_called_once()
+    sleep_mock.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_circuit_open_serves_snapshot(http_client, request_mock, sleep_mock, monotonic_mock):
+    request_mock.side_effect = [response_mock(_PAGE)] + [NetworkError()] * 3
+    achievements = await http_client.get_achievements()
+
+    with pytest.raises(NetworkError):
+        await http_client.get_achievements()
+
+    request_mock.reset_mock()
+    assert await http_client.get_achievements() == achievements
+    request_mock.assert_not_called()
@@ -0,0 +1,64 @@
+import pytest
+
+from poe_types import AchievementName, Timestamp
+from poe_unlock_store import UnlockTimeStore
+
+_UNLOCK_TIME = Timestamp(1549494000)
+_NEXT_UNLOCK_TIME = Timestamp(1549497600)
+
+
+@pytest.fixture()
+def store_path(tmp_path):
+    return str(tmp_path / "achievements" / "profile_name.log")
+
+
+def test_missing_store(store_path):
+    store = UnlockTimeStore(store_path)
+
+    assert len(store) == 0
+    assert store.get(AchievementName("Shaper of Worlds")) is None
+
+
+def test_record_persisted(store_path):
+    store = UnlockTimeStore(store_path)
+    store.record([AchievementName("Shaper of Worlds"), AchievementName("Augmentation")], _UNLOCK_TIME)
+    store.record([AchievementName("Shaper of Worlds"), AchievementName("New World Order")], _NEXT_UNLOCK_TIME)
+
+    reloaded_store = UnlockTimeStore(store_path)
+    assert len(reloaded_store) == 3
+    assert reloaded_store.get(AchievementName("Shaper of Worlds")) == _UNLOCK_TIME
+    assert reloaded_store.get(AchievementName("Augmentation")) == _UNLOCK_TIME
+    assert reloaded_store.get(AchievementName("New World Order")) == _NEXT_UNLOCK_TIME
+
+
+def test_record_appends(store_path):
+    UnlockTimeStore(store_path).record([AchievementName("Shaper of Worlds")], _UNLOCK_TIME)
+    UnlockTimeStore(store_path).record([AchievementName("Augmentation")], _NEXT_UNLOCK_TIME)
+
+    with open(store_path, "rb") as store:
+        assert store.read() == b"1549494000\tShaper of Worlds\n1549497600\tAugmentation\n"
+
+
+def test_torn_record_dropped(store_path):
+    UnlockTimeStore(store_path).record([AchievementName("Shaper of Worlds")], _UNLOCK_TIME)
+    with open(store_path, "ab") as store:
+        store.write(b"garbage\n1549497600\tAugmen")
+
+    store = UnlockTimeStore(store_path)
+    assert AchievementName("Augmentation") not in store
+    store.record([AchievementName("New World Order")], _NEXT_UNLOCK_TIME)
+
+    with open(store_path, "rb") as store:
+        assert store.read() == b"1549494000\tShaper of Worlds\ngarbage\n1549497600\tNew World Order\n"
+
+
+def test_line_breaks_escaped(store_path):
+    achievement_names = [AchievementName("Shaper\nof Worlds"), AchievementName("Aug\\nmentation\r")]
+    UnlockTimeStore(store_path).record(achievement_names, _UNLOCK_TIME)
+
+    with open(store_path, "rb") as store:
+        assert store.read() == b"1549494000\tShaper\\nof Worlds\n1549494000\tAug\\\\nmentation\\r\n"
+
+    reloaded_store = UnlockTimeStore(store_path)
+    assert len(reloaded_store) == 2
+    assert all(reloaded_store.get(achievement_name) == _UNLOCK_TIME for achievement_name in achievement_names)
@@ -1,6 +1,29 @@
 from unittest.mock import MagicMock
 
+from multidict import CIMultiDict, CIMultiDictProxy
+
 
 class AsyncMock(MagicMock):
     async def __call__(self, *args, **kwargs):
         return super(AsyncMock, self).__call__(*args, **kwargs)
+
+
+def response_mock(body: bytes = b"", chunk_size: int = 1024, status: int = 200, headers: dict = None) -> MagicMock:
+    response = MagicMock(spec=())
+    response.status = status
+    response.headers = CIMultiDictProxy(CIMultiDict(headers or {}))
+    response.read = AsyncMock(return_value=body)
+    response.release = MagicMock()
+    response.close = MagicMock()
+    response.content = MagicMock(spec=())
+    response.content.read_size = 0
+
+    async def iter_chunked(_):
+        while response.content.read_size < len(body):
+            chunk = body[response.content.read_size:response.content.read_size + chunk_size]
+            response.content.read_size += len(chunk)
+            yield chunk
+
+    response.content.iter_chunked = iter_chunked
+    response.content.at_eof = lambda: response.content.read_size >= len(body)
+    return response